@@ -1,15 +1,30 @@
 #!/usr/bin/env python
 """
-Iran Tier Analysis Report.
+Nationality Tier Analysis Report.
 
-Generates detailed tier classification report for Iran based on worker stock data.
+Generates detailed tier classification reports from worker stock data,
+for Iran by default or for every restricted nationality with --all.
 """
 
+import argparse
+import bisect
 import csv
+import heapq
 import sys
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+from typing import TextIO
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config.settings import RESTRICTED_NATIONALITIES, ParameterRegistry
+from src.engines.quota_engine import NATIONALITY_CODES
 
 # Fix Windows console encoding
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -18,22 +33,31 @@ sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 REAL_DATA_DIR = Path('real_data')
 REPORT_DIR = Path('reports')
 
-# Iran ISO code
-IRAN_CODE = '364'
+# Worker states counted as active (compared upper-cased)
+ACTIVE_STATES = frozenset({'ACTIVE', 'IN_COUNTRY', ''})
+
+# Worker stock columns used by the analysis, besides the nationality
+WORKER_COLUMNS = ['state', 'profession_code', 'activity_code']
+
+
+# Tiers by ascending share threshold (from ParameterRegistry); shares
+# below the lowest threshold are Tier 4
+_TIER_TABLE = (
+    (ParameterRegistry.TIER_3_THRESHOLD, (3, "Minor", "1-5%")),
+    (ParameterRegistry.TIER_2_THRESHOLD, (2, "Secondary", "5-15%")),
+    (ParameterRegistry.TIER_1_THRESHOLD, (1, "Primary", ">15%")),
+)
+_TIER_KEYS = tuple(threshold for threshold, _ in _TIER_TABLE)
+_TIER_4 = (4, "Unusual", "<1%")
 
 
 def calculate_tier(share_pct: float) -> tuple:
     """Calculate tier level based on share percentage."""
-    if share_pct >= 0.15:
-        return 1, "Primary", ">15%"
-    elif share_pct >= 0.05:
-        return 2, "Secondary", "5-15%"
-    elif share_pct >= 0.01:
-        return 3, "Minor", "1-5%"
-    else:
-        return 4, "Unusual", "<1%"
+    i = bisect.bisect_right(_TIER_KEYS, share_pct)
+    return _TIER_TABLE[i - 1][1] if i else _TIER_4
 
 
+@lru_cache(maxsize=1)
 def load_professions() -> dict:
     """Load profession code to name mapping."""
     profs = {}
@@ -45,6 +69,7 @@ def load_professions() -> dict:
     return profs
 
 
+@lru_cache(maxsize=1)
 def load_activities() -> dict:
     """Load activity code to name mapping."""
     acts = {}
@@ -56,63 +81,118 @@ def load_activities() -> dict:
     return acts
 
 
+def _first_int(row: dict, *keys: str) -> int:
+    """Return the first non-empty integer value among keys, else 0."""
+    for key in keys:
+        value = row.get(key)
+        if value:
+            try:
+                return int(value)
+            except ValueError:
+                pass
+    return 0
+
+
+def _clean_nat_code(code: str) -> str:
+    """Canonical nationality code: unquoted, without zero padding ('"050"' -> '50')."""
+    return code.strip().strip('"').lstrip('0') or '0'
+
+
+@lru_cache(maxsize=1)
 def load_caps() -> dict:
-    """Load nationality caps."""
+    """Load nationality caps, keyed by canonical nationality code."""
     caps = {}
     with open(REAL_DATA_DIR / '05_nationality_caps.csv', encoding='utf-8') as f:
         for row in csv.DictReader(f):
             nat_code = row.get('nationality_code', '')
-            if nat_code:
-                caps[nat_code] = {
-                    'current_cap': int(row.get('current_cap', 0) or 0),
-                    'previous_cap': int(row.get('previous_cap', 0) or 0),
-                    'base_cap': int(row.get('base_cap', 0) or 0),
+            if nat_code.strip().strip('"'):
+                caps[_clean_nat_code(nat_code)] = {
+                    'current_cap': _first_int(row, 'cap_limit', 'current_cap'),
+                    'previous_cap': _first_int(row, 'previous_cap'),
+                    'base_cap': _first_int(row, 'base_cap'),
                 }
     return caps
 
 
-def analyze_iran():
-    """Analyze Iran worker data and generate report."""
+def load_worker_stock() -> tuple:
+    """
+    Load the worker stock columns the analysis needs.
+    
+    Returns:
+        tuple: (DataFrame with categorical columns, nationality column name)
+    """
+    stock_path = REAL_DATA_DIR / '07_worker_stock.csv'
+    
+    # Older extracts name the nationality column 'nationality'; pick the
+    # column once from the header rather than checking both per row
+    header = pd.read_csv(stock_path, nrows=0).columns
+    nat_key = 'nationality_code' if 'nationality_code' in header else 'nationality'
+    columns = [nat_key, *WORKER_COLUMNS]
+    
+    # Categorical columns keep each distinct code once
+    stock = pd.read_csv(
+        stock_path,
+        usecols=columns,
+        dtype=dict.fromkeys(columns, 'category'),
+        keep_default_na=False,
+    )
+    return stock, nat_key
+
+
+def analyze_nationality(nat_code: str, nat_name: str, profs: dict, acts: dict, caps: dict,
+                        stock: pd.DataFrame, nat_key: str, run_at: datetime,
+                        formats: tuple = ('text', 'markdown')):
+    """
+    Analyze one nationality's worker data and generate its reports.
+    
+    Reference data and worker stock are passed in so a batch run loads
+    them once for every nationality.
+    
+    Args:
+        nat_code: Numeric nationality code as used in worker stock (e.g. '364').
+        nat_name: Display name (e.g. 'Iran').
+        profs: Profession code -> name.
+        acts: Activity code -> name.
+        caps: Nationality code -> cap entry.
+        stock: Worker stock from load_worker_stock().
+        nat_key: Nationality column name in stock.
+        run_at: Run timestamp shown in the reports.
+        formats: Report formats to write ('text' and/or 'markdown').
+    """
+    generated_at = run_at.strftime('%Y-%m-%d %H:%M:%S')
+    
     print("=" * 80)
-    print("IRAN TIER ANALYSIS REPORT")
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"{nat_name.upper()} TIER ANALYSIS REPORT")
+    print(f"Generated: {generated_at}")
     print("=" * 80)
     print()
     
-    # Load reference data
-    print("Loading reference data...")
-    profs = load_professions()
-    acts = load_activities()
-    caps = load_caps()
-    
-    # Load worker stock
-    print("Loading worker stock data...")
-    with open(REAL_DATA_DIR / '07_worker_stock.csv', encoding='utf-8') as f:
-        all_workers = list(csv.DictReader(f))
-    
-    # Filter Iran workers (ACTIVE only)
-    iran_workers = [w for w in all_workers 
-                    if (w.get('nationality_code') == IRAN_CODE or w.get('nationality') == IRAN_CODE)
-                    and w.get('state', '').upper() in ('ACTIVE', 'IN_COUNTRY', '')]
-    
-    print(f"Iran workers (active): {len(iran_workers)}")
+    # Filter the nationality's workers (ACTIVE only); nationality codes
+    # (quoted, zero-padded...) and state case are normalised on the
+    # categories rather than on every row
+    clean_code = _clean_nat_code(nat_code)
+    raw_codes = stock[nat_key].cat.categories
+    nat_codes = raw_codes[raw_codes.map(_clean_nat_code) == clean_code]
+    states = stock['state'].cat.categories
+    active_states = states[states.str.upper().isin(ACTIVE_STATES)]
+    workers = stock[stock[nat_key].isin(nat_codes) & stock['state'].isin(active_states)]
+    total_workers = len(workers)
+    
+    # Aggregate by profession and activity (first-seen order, like the
+    # original dict counts, so ties sort the same way)
+    prof_counts = Counter(workers.groupby('profession_code', sort=False, observed=True).size().to_dict())
+    activity_counts = Counter(workers.groupby('activity_code', sort=False, observed=True).size().to_dict())
+    
+    print(f"{nat_name} workers (active): {total_workers}")
     print()
     
     # Get cap info
-    iran_cap = caps.get(IRAN_CODE, {})
-    current_cap = iran_cap.get('current_cap', 0)
-    previous_cap = iran_cap.get('previous_cap', 0)
-    
-    # Aggregate by profession
-    prof_counts = defaultdict(int)
-    for w in iran_workers:
-        prof_code = w.get('profession_code', 'Unknown')
-        prof_counts[prof_code] += 1
-    
-    # Calculate totals and shares
-    total_workers = len(iran_workers)
-    prof_data = []
+    nat_cap = caps.get(clean_code, {})
+    current_cap = nat_cap.get('current_cap', 0)
+    previous_cap = nat_cap.get('previous_cap', 0)
     
+    # Calculate shares
+    prof_data = []
     for code, count in prof_counts.items():
         share = count / total_workers if total_workers > 0 else 0
         tier, tier_name, tier_range = calculate_tier(share)
@@ -125,8 +205,10 @@ def analyze_iran():
             'tier_name': tier_name
         })
     
-    # Sort by count
-    prof_data.sort(key=lambda x: -x['count'])
+    # Only the largest professions are listed, so pick them with a heap
+    # instead of sorting every profession (ties keep first-seen order)
+    by_count = itemgetter('count')
+    top_profs = heapq.nlargest(20, prof_data, key=by_count)
     
     # Tier summaries
     tier_summary = {1: {'count': 0, 'workers': 0, 'profs': []},
@@ -138,22 +220,17 @@ def analyze_iran():
         tier = p['tier']
         tier_summary[tier]['count'] += 1
         tier_summary[tier]['workers'] += p['count']
-        if len(tier_summary[tier]['profs']) < 10:
-            tier_summary[tier]['profs'].append(p)
+        tier_summary[tier]['profs'].append(p)
     
-    # Aggregate by activity
-    activity_counts = defaultdict(int)
-    for w in iran_workers:
-        act_code = w.get('activity_code', 'Unknown')
-        activity_counts[act_code] += 1
+    for ts in tier_summary.values():
+        ts['profs'] = heapq.nlargest(10, ts['profs'], key=by_count)
     
     activity_data = [(acts.get(code, f'Activity_{code}'), count) 
-                     for code, count in activity_counts.items()]
-    activity_data.sort(key=lambda x: -x[1])
+                     for code, count in activity_counts.most_common(10)]
     
-    # Check for dominance alerts
+    # Check for dominance alerts (a share of 30%+ is always in the top 3)
     alerts = []
-    for p in prof_data:
+    for p in top_profs:
         if p['share'] >= 0.30:
             level = "CRITICAL" if p['share'] >= 0.50 else "HIGH" if p['share'] >= 0.40 else "WATCH"
             alerts.append({
@@ -170,8 +247,11 @@ def analyze_iran():
     # Calculate growth
     growth_pct = ((current_cap - previous_cap) / previous_cap * 100) if previous_cap > 0 else 0
     
-    # Generate report
-    report = generate_report(
+    report_data = dict(
+        nat_code=nat_code,
+        nat_name=nat_name,
+        generated_at=generated_at,
+        generated_date=run_at.strftime('%B %d, %Y'),
         total_workers=total_workers,
         current_cap=current_cap,
         previous_cap=previous_cap,
@@ -179,339 +259,362 @@ def analyze_iran():
         utilization=utilization,
         growth_pct=growth_pct,
         num_professions=len(prof_data),
-        prof_data=prof_data,
+        top_profs=top_profs,
         tier_summary=tier_summary,
         activity_data=activity_data,
         alerts=alerts
     )
     
-    # Save report
+    # Write reports straight to disk
     REPORT_DIR.mkdir(exist_ok=True)
     
-    # Text report
-    txt_path = REPORT_DIR / "iran_tier_analysis_2026.txt"
-    with open(txt_path, 'w', encoding='utf-8') as f:
-        f.write(report)
-    print(f"Saved: {txt_path}")
-    
-    # Markdown report
-    md_report = generate_markdown_report(
-        total_workers=total_workers,
-        current_cap=current_cap,
-        previous_cap=previous_cap,
-        headroom=headroom,
-        utilization=utilization,
-        growth_pct=growth_pct,
-        num_professions=len(prof_data),
-        prof_data=prof_data,
-        tier_summary=tier_summary,
-        activity_data=activity_data,
-        alerts=alerts
-    )
+    if 'text' in formats:
+        txt_path = REPORT_DIR / f"{nat_name.lower()}_tier_analysis_2026.txt"
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            generate_report(f, **report_data)
+        print(f"Saved: {txt_path}")
     
-    md_path = REPORT_DIR / "Iran_Tier_Analysis_2026.md"
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_report)
-    print(f"Saved: {md_path}")
+    if 'markdown' in formats:
+        md_path = REPORT_DIR / f"{nat_name}_Tier_Analysis_2026.md"
+        with open(md_path, 'w', encoding='utf-8') as f:
+            generate_markdown_report(f, **report_data)
+        print(f"Saved: {md_path}")
     
     print()
     print("=" * 80)
-    print("[OK] Iran report generated!")
+    print(f"[OK] {nat_name} report generated!")
     print("=" * 80)
     print()
     
-    # Print summary
-    print(report)
+    # Short summary only; the full report is in the saved files
+    print(f"Workers: {total_workers:,}  Cap: {current_cap:,}  "
+          f"Util: {utilization*100:.1f}%  Alerts: {len(alerts)}")
+    print()
 
 
-def generate_report(**data) -> str:
-    """Generate text report."""
-    lines = []
+def generate_report(out: TextIO, **data) -> None:
+    """Write the text report to out, line by line."""
+    emit = partial(print, file=out)
     
-    lines.append("=" * 80)
-    lines.append("  IRAN - TIER ANALYSIS REPORT")
-    lines.append(f"  Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("  Data Source: Ministry Worker Stock Data")
-    lines.append("=" * 80)
-    lines.append("")
+    emit("=" * 80)
+    emit(f"  {data['nat_name'].upper()} - TIER ANALYSIS REPORT")
+    emit(f"  Report Generated: {data['generated_at']}")
+    emit("  Data Source: Ministry Worker Stock Data")
+    emit("=" * 80)
+    emit()
     
     # Section 1: Executive Summary
-    lines.append("-" * 80)
-    lines.append("  SECTION 1: EXECUTIVE SUMMARY")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append("  KEY PERFORMANCE INDICATORS")
-    lines.append("  +" + "-" * 76 + "+")
-    lines.append(f"  | {'Metric':<35} | {'Value':>18} | {'Status':>15} |")
-    lines.append("  +" + "-" * 76 + "+")
-    lines.append(f"  | {'Total Active Workers':<35} | {data['total_workers']:>18,} | {'Current Stock':>15} |")
-    lines.append(f"  | {'Current Cap':<35} | {data['current_cap']:>18,} | {'Limit':>15} |")
-    lines.append(f"  | {'Previous Cap':<35} | {data['previous_cap']:>18,} | {'Prior Year':>15} |")
-    lines.append(f"  | {'Available Headroom':<35} | {data['headroom']:>18,} | {'Capacity':>15} |")
-    lines.append(f"  | {'Number of Professions':<35} | {data['num_professions']:>18,} | {'Diversity':>15} |")
-    lines.append("  +" + "-" * 76 + "+")
-    lines.append("")
+    emit("-" * 80)
+    emit("  SECTION 1: EXECUTIVE SUMMARY")
+    emit("-" * 80)
+    emit()
+    emit("  KEY PERFORMANCE INDICATORS")
+    emit("  +" + "-" * 76 + "+")
+    emit(f"  | {'Metric':<35} | {'Value':>18} | {'Status':>15} |")
+    emit("  +" + "-" * 76 + "+")
+    emit(f"  | {'Total Active Workers':<35} | {data['total_workers']:>18,} | {'Current Stock':>15} |")
+    emit(f"  | {'Current Cap':<35} | {data['current_cap']:>18,} | {'Limit':>15} |")
+    emit(f"  | {'Previous Cap':<35} | {data['previous_cap']:>18,} | {'Prior Year':>15} |")
+    emit(f"  | {'Available Headroom':<35} | {data['headroom']:>18,} | {'Capacity':>15} |")
+    emit(f"  | {'Number of Professions':<35} | {data['num_professions']:>18,} | {'Diversity':>15} |")
+    emit("  +" + "-" * 76 + "+")
+    emit()
     
     # Utilization bar
     util = data['utilization']
     util_bar_len = 50
     filled = int(min(util, 1.0) * util_bar_len)
     bar = "[" + "#" * filled + "-" * (util_bar_len - filled) + "]"
-    lines.append(f"  CAP UTILIZATION: {bar} {util*100:.1f}%")
-    lines.append(f"                   0%{' ' * 22}50%{' ' * 21}100%")
-    lines.append("")
+    emit(f"  CAP UTILIZATION: {bar} {util*100:.1f}%")
+    emit(f"                   0%{' ' * 22}50%{' ' * 21}100%")
+    emit()
     
     # Growth
     growth = data['growth_pct']
     growth_indicator = "+" if growth > 0 else ""
-    lines.append(f"  CAP GROWTH: {growth_indicator}{growth:.1f}% from previous year")
-    lines.append("")
+    emit(f"  CAP GROWTH: {growth_indicator}{growth:.1f}% from previous year")
+    emit()
     
     # Section 2: Tier Classification
-    lines.append("-" * 80)
-    lines.append("  SECTION 2: TIER CLASSIFICATION & STATUS")
-    lines.append("-" * 80)
-    lines.append("")
+    emit("-" * 80)
+    emit("  SECTION 2: TIER CLASSIFICATION & STATUS")
+    emit("-" * 80)
+    emit()
     
-    lines.append("  TIER SUMMARY")
-    lines.append("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
-    lines.append(f"  | {'Tier':<16} | {'Profs':>10} | {'Workers':>13} | {'Share %':>10} |")
-    lines.append("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
+    emit("  TIER SUMMARY")
+    emit("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
+    emit(f"  | {'Tier':<16} | {'Profs':>10} | {'Workers':>13} | {'Share %':>10} |")
+    emit("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
     
     tier_names = {1: "Tier 1 (Primary)", 2: "Tier 2 (Secondary)", 3: "Tier 3 (Minor)", 4: "Tier 4 (Unusual)"}
     total = data['total_workers']
     for tier_level in [1, 2, 3, 4]:
         ts = data['tier_summary'][tier_level]
         tier_share = ts['workers'] / total * 100 if total > 0 else 0
-        lines.append(f"  | {tier_names[tier_level]:<16} | {ts['count']:>10,} | {ts['workers']:>13,} | {tier_share:>9.1f}% |")
+        emit(f"  | {tier_names[tier_level]:<16} | {ts['count']:>10,} | {ts['workers']:>13,} | {tier_share:>9.1f}% |")
     
-    lines.append("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
-    lines.append("")
+    emit("  +" + "-" * 18 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+")
+    emit()
     
     # Top professions per tier
-    lines.append("  TOP PROFESSIONS BY TIER")
-    lines.append("")
+    emit("  TOP PROFESSIONS BY TIER")
+    emit()
     
     for tier_level in [1, 2, 3, 4]:
         tier_name_full = ["Primary (>15%)", "Secondary (5-15%)", "Minor (1-5%)", "Unusual (<1%)"][tier_level-1]
         tier_profs = data['tier_summary'][tier_level]['profs'][:5]
         
         if tier_profs:
-            lines.append(f"    TIER {tier_level} - {tier_name_full}")
+            emit(f"    TIER {tier_level} - {tier_name_full}")
             for p in tier_profs:
-                lines.append(f"      - {p['name'][:35]:<35} {p['count']:>8,} workers ({p['share']*100:>5.1f}%)")
-            lines.append("")
+                emit(f"      - {p['name'][:35]:<35} {p['count']:>8,} workers ({p['share']*100:>5.1f}%)")
+            emit()
     
     # Section 3: Dominance Risk
-    lines.append("-" * 80)
-    lines.append("  SECTION 3: DOMINANCE RISK ASSESSMENT")
-    lines.append("-" * 80)
-    lines.append("")
+    emit("-" * 80)
+    emit("  SECTION 3: DOMINANCE RISK ASSESSMENT")
+    emit("-" * 80)
+    emit()
     
     if data['alerts']:
-        lines.append("  ACTIVE DOMINANCE ALERTS")
-        lines.append("")
+        emit("  ACTIVE DOMINANCE ALERTS")
+        emit()
         for alert in data['alerts']:
             level = alert["level"]
             icon = {"CRITICAL": "[!!!]", "HIGH": "[!!]", "WATCH": "[!]"}.get(level, "[?]")
             blocking = " ** BLOCKING NEW APPROVALS **" if alert["is_blocking"] else ""
-            lines.append(f"    {icon} {level} ALERT{blocking}")
-            lines.append(f"        Profession: {alert['name']}")
-            lines.append(f"        Share: {alert['share']*100:.1f}%")
-            lines.append("")
+            emit(f"    {icon} {level} ALERT{blocking}")
+            emit(f"        Profession: {alert['name']}")
+            emit(f"        Share: {alert['share']*100:.1f}%")
+            emit()
     else:
-        lines.append("  [OK] No active dominance alerts")
-        lines.append("  All professions are below the 30% concentration threshold.")
-    lines.append("")
+        emit("  [OK] No active dominance alerts")
+        emit("  All professions are below the 30% concentration threshold.")
+    emit()
     
     # Section 4: Top 20 Professions
-    lines.append("-" * 80)
-    lines.append("  SECTION 4: TOP 20 PROFESSIONS BY WORKER COUNT")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append(f"  {'#':<3} {'Profession':<40} {'Tier':<6} {'Workers':>10} {'Share%':>8}")
-    lines.append("  " + "-" * 70)
+    emit("-" * 80)
+    emit("  SECTION 4: TOP 20 PROFESSIONS BY WORKER COUNT")
+    emit("-" * 80)
+    emit()
+    emit(f"  {'#':<3} {'Profession':<40} {'Tier':<6} {'Workers':>10} {'Share%':>8}")
+    emit("  " + "-" * 70)
     
-    for i, p in enumerate(data['prof_data'][:20], 1):
-        lines.append(f"  {i:<3} {p['name'][:40]:<40} T{p['tier']:<5} {p['count']:>10,} {p['share']*100:>7.1f}%")
+    for i, p in enumerate(data['top_profs'], 1):
+        emit(f"  {i:<3} {p['name'][:40]:<40} T{p['tier']:<5} {p['count']:>10,} {p['share']*100:>7.1f}%")
     
-    lines.append("")
+    emit()
     
     # Section 5: Economic Activities
-    lines.append("-" * 80)
-    lines.append("  SECTION 5: TOP 10 ECONOMIC ACTIVITIES")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append(f"  {'#':<3} {'Activity':<50} {'Workers':>10} {'Share%':>8}")
-    lines.append("  " + "-" * 75)
-    
-    for i, (name, count) in enumerate(data['activity_data'][:10], 1):
+    emit("-" * 80)
+    emit("  SECTION 5: TOP 10 ECONOMIC ACTIVITIES")
+    emit("-" * 80)
+    emit()
+    emit(f"  {'#':<3} {'Activity':<50} {'Workers':>10} {'Share%':>8}")
+    emit("  " + "-" * 75)
+    
+    for i, (name, count) in enumerate(data['activity_data'], 1):
         share = count / data['total_workers'] * 100 if data['total_workers'] > 0 else 0
-        lines.append(f"  {i:<3} {name[:50]:<50} {count:>10,} {share:>7.1f}%")
-    
-    lines.append("")
-    lines.append("=" * 80)
-    lines.append("  END OF REPORT")
-    lines.append("=" * 80)
+        emit(f"  {i:<3} {name[:50]:<50} {count:>10,} {share:>7.1f}%")
     
-    return "\n".join(lines)
+    emit()
+    emit("=" * 80)
+    emit("  END OF REPORT")
+    emit("=" * 80)
 
 
-def generate_markdown_report(**data) -> str:
-    """Generate markdown report."""
-    lines = []
-    
-    lines.append("# Iran Tier Analysis Report 2026")
-    lines.append("")
-    lines.append(f"**Report Generated:** {datetime.now().strftime('%B %d, %Y')}")
-    lines.append("**Data Source:** Ministry Worker Stock Data")
-    lines.append("**Nationality:** Iran (ISO Code: 364)")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+def generate_markdown_report(out: TextIO, **data) -> None:
+    """Write the markdown report to out, line by line."""
+    emit = partial(print, file=out)
+    
+    emit(f"# {data['nat_name']} Tier Analysis Report 2026")
+    emit()
+    emit(f"**Report Generated:** {data['generated_date']}")
+    emit("**Data Source:** Ministry Worker Stock Data")
+    emit(f"**Nationality:** {data['nat_name']} (ISO Code: {data['nat_code']})")
+    emit()
+    emit("---")
+    emit()
     
     # Executive Summary
-    lines.append("## Executive Summary")
-    lines.append("")
-    lines.append("### Key Metrics at a Glance")
-    lines.append("")
-    lines.append("| Metric | Value |")
-    lines.append("|--------|-------|")
-    lines.append(f"| **Total Active Workers** | {data['total_workers']:,} |")
-    lines.append(f"| **Current Cap** | {data['current_cap']:,} |")
-    lines.append(f"| **Previous Cap** | {data['previous_cap']:,} |")
-    lines.append(f"| **Available Headroom** | {data['headroom']:,} |")
-    lines.append(f"| **Cap Utilization** | {data['utilization']*100:.1f}% |")
-    lines.append(f"| **Cap Growth** | {'+' if data['growth_pct'] > 0 else ''}{data['growth_pct']:.1f}% |")
-    lines.append(f"| **Number of Professions** | {data['num_professions']:,} |")
-    lines.append(f"| **Active Alerts** | {len(data['alerts'])} |")
-    lines.append("")
+    emit("## Executive Summary")
+    emit()
+    emit("### Key Metrics at a Glance")
+    emit()
+    emit("| Metric | Value |")
+    emit("|--------|-------|")
+    emit(f"| **Total Active Workers** | {data['total_workers']:,} |")
+    emit(f"| **Current Cap** | {data['current_cap']:,} |")
+    emit(f"| **Previous Cap** | {data['previous_cap']:,} |")
+    emit(f"| **Available Headroom** | {data['headroom']:,} |")
+    emit(f"| **Cap Utilization** | {data['utilization']*100:.1f}% |")
+    emit(f"| **Cap Growth** | {'+' if data['growth_pct'] > 0 else ''}{data['growth_pct']:.1f}% |")
+    emit(f"| **Number of Professions** | {data['num_professions']:,} |")
+    emit(f"| **Active Alerts** | {len(data['alerts'])} |")
+    emit()
     
     # Utilization bar
     util = data['utilization']
     filled = int(min(util, 1.0) * 50)
     bar = "#" * filled + "-" * (50 - filled)
-    lines.append("### Cap Utilization")
-    lines.append("")
-    lines.append("```")
-    lines.append(f"[{bar}] {util*100:.1f}%")
-    lines.append("```")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit("### Cap Utilization")
+    emit()
+    emit("```")
+    emit(f"[{bar}] {util*100:.1f}%")
+    emit("```")
+    emit()
+    emit("---")
+    emit()
     
     # Tier Classification
-    lines.append("## Tier Classification")
-    lines.append("")
-    lines.append("### Tier Definitions")
-    lines.append("")
-    lines.append("| Tier | Name | Share Range | Description |")
-    lines.append("|------|------|-------------|-------------|")
-    lines.append("| **Tier 1** | Primary | > 15% | Dominant professions requiring monitoring |")
-    lines.append("| **Tier 2** | Secondary | 5% - 15% | Significant professions |")
-    lines.append("| **Tier 3** | Minor | 1% - 5% | Regular professions |")
-    lines.append("| **Tier 4** | Unusual | < 1% | Specialized/niche professions |")
-    lines.append("")
-    
-    lines.append("### Tier Distribution")
-    lines.append("")
-    lines.append("| Tier | Professions | Workers | Share % |")
-    lines.append("|------|-------------|---------|---------|")
+    emit("## Tier Classification")
+    emit()
+    emit("### Tier Definitions")
+    emit()
+    emit("| Tier | Name | Share Range | Description |")
+    emit("|------|------|-------------|-------------|")
+    emit("| **Tier 1** | Primary | > 15% | Dominant professions requiring monitoring |")
+    emit("| **Tier 2** | Secondary | 5% - 15% | Significant professions |")
+    emit("| **Tier 3** | Minor | 1% - 5% | Regular professions |")
+    emit("| **Tier 4** | Unusual | < 1% | Specialized/niche professions |")
+    emit()
+    
+    emit("### Tier Distribution")
+    emit()
+    emit("| Tier | Professions | Workers | Share % |")
+    emit("|------|-------------|---------|---------|")
     
     tier_names = {1: "Tier 1 (Primary)", 2: "Tier 2 (Secondary)", 3: "Tier 3 (Minor)", 4: "Tier 4 (Unusual)"}
     total = data['total_workers']
     for tier_level in [1, 2, 3, 4]:
         ts = data['tier_summary'][tier_level]
         tier_share = ts['workers'] / total * 100 if total > 0 else 0
-        lines.append(f"| {tier_names[tier_level]} | {ts['count']:,} | {ts['workers']:,} | {tier_share:.1f}% |")
+        emit(f"| {tier_names[tier_level]} | {ts['count']:,} | {ts['workers']:,} | {tier_share:.1f}% |")
     
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit()
+    emit("---")
+    emit()
     
     # Top Professions by Tier
-    lines.append("## Top Professions by Tier")
-    lines.append("")
+    emit("## Top Professions by Tier")
+    emit()
     
     for tier_level in [1, 2, 3, 4]:
         tier_name_full = ["Primary (>15%)", "Secondary (5-15%)", "Minor (1-5%)", "Unusual (<1%)"][tier_level-1]
         tier_profs = data['tier_summary'][tier_level]['profs'][:5]
         
-        lines.append(f"### Tier {tier_level} - {tier_name_full}")
-        lines.append("")
+        emit(f"### Tier {tier_level} - {tier_name_full}")
+        emit()
         
         if tier_profs:
-            lines.append("| Profession | Workers | Share % |")
-            lines.append("|------------|---------|---------|")
+            emit("| Profession | Workers | Share % |")
+            emit("|------------|---------|---------|")
             for p in tier_profs:
-                lines.append(f"| {p['name']} | {p['count']:,} | {p['share']*100:.1f}% |")
+                emit(f"| {p['name']} | {p['count']:,} | {p['share']*100:.1f}% |")
         else:
-            lines.append("*No professions in this tier - indicates good diversification*")
-        lines.append("")
+            emit("*No professions in this tier - indicates good diversification*")
+        emit()
     
-    lines.append("---")
-    lines.append("")
+    emit("---")
+    emit()
     
     # Dominance Risk
-    lines.append("## Dominance Risk Assessment")
-    lines.append("")
+    emit("## Dominance Risk Assessment")
+    emit()
     
     if data['alerts']:
-        lines.append("### Active Alerts")
-        lines.append("")
-        lines.append("| Profession | Share % | Alert Level | Status |")
-        lines.append("|------------|---------|-------------|--------|")
+        emit("### Active Alerts")
+        emit()
+        emit("| Profession | Share % | Alert Level | Status |")
+        emit("|------------|---------|-------------|--------|")
         for alert in data['alerts']:
             status = "BLOCKING" if alert['is_blocking'] else "Monitor"
-            lines.append(f"| **{alert['name']}** | **{alert['share']*100:.1f}%** | {alert['level']} | {status} |")
-        lines.append("")
+            emit(f"| **{alert['name']}** | **{alert['share']*100:.1f}%** | {alert['level']} | {status} |")
+        emit()
     else:
-        lines.append("**Status:** No active alerts")
-        lines.append("")
-        lines.append("All professions are below the 30% concentration threshold. Iran demonstrates a well-diversified workforce distribution.")
-        lines.append("")
-    
-    lines.append("### Alert Thresholds Reference")
-    lines.append("")
-    lines.append("| Level | Threshold | Action |")
-    lines.append("|-------|-----------|--------|")
-    lines.append("| **WATCH** | 30% - 39% | Monitor trends |")
-    lines.append("| **HIGH** | 40% - 49% | Active intervention |")
-    lines.append("| **CRITICAL** | 50%+ | Blocking new approvals |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+        emit("**Status:** No active alerts")
+        emit()
+        emit(f"All professions are below the 30% concentration threshold. {data['nat_name']} demonstrates a well-diversified workforce distribution.")
+        emit()
+    
+    emit("### Alert Thresholds Reference")
+    emit()
+    emit("| Level | Threshold | Action |")
+    emit("|-------|-----------|--------|")
+    emit("| **WATCH** | 30% - 39% | Monitor trends |")
+    emit("| **HIGH** | 40% - 49% | Active intervention |")
+    emit("| **CRITICAL** | 50%+ | Blocking new approvals |")
+    emit()
+    emit("---")
+    emit()
     
     # Top 20 Professions
-    lines.append("## Top 20 Professions by Worker Count")
-    lines.append("")
-    lines.append("| # | Profession | Tier | Workers | Share % |")
-    lines.append("|---|------------|------|---------|---------|")
+    emit("## Top 20 Professions by Worker Count")
+    emit()
+    emit("| # | Profession | Tier | Workers | Share % |")
+    emit("|---|------------|------|---------|---------|")
     
-    for i, p in enumerate(data['prof_data'][:20], 1):
-        lines.append(f"| {i} | {p['name']} | T{p['tier']} | {p['count']:,} | {p['share']*100:.1f}% |")
+    for i, p in enumerate(data['top_profs'], 1):
+        emit(f"| {i} | {p['name']} | T{p['tier']} | {p['count']:,} | {p['share']*100:.1f}% |")
     
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit()
+    emit("---")
+    emit()
     
     # Economic Activities
-    lines.append("## Top 10 Economic Activities")
-    lines.append("")
-    lines.append("| # | Activity | Workers | Share % |")
-    lines.append("|---|----------|---------|---------|")
+    emit("## Top 10 Economic Activities")
+    emit()
+    emit("| # | Activity | Workers | Share % |")
+    emit("|---|----------|---------|---------|")
     
-    for i, (name, count) in enumerate(data['activity_data'][:10], 1):
+    for i, (name, count) in enumerate(data['activity_data'], 1):
         share = count / data['total_workers'] * 100 if data['total_workers'] > 0 else 0
-        lines.append(f"| {i} | {name} | {count:,} | {share:.1f}% |")
+        emit(f"| {i} | {name} | {count:,} | {share:.1f}% |")
     
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("*End of Report*")
+    emit()
+    emit("---")
+    emit()
+    emit("*End of Report*")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Generate nationality tier analysis reports")
+    parser.add_argument(
+        "--format",
+        choices=["text", "markdown", "both"],
+        default="both",
+        help="Report format(s) to write (default: both)"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Report on every restricted nationality instead of Iran only"
+    )
+    args = parser.parse_args()
+    
+    formats = ('text', 'markdown') if args.format == "both" else (args.format,)
+    
+    # One timestamp for the whole run, so all outputs agree
+    run_at = datetime.now()
+    
+    # Load reference data and worker stock once for all nationalities
+    print("Loading reference data...")
+    profs = load_professions()
+    acts = load_activities()
+    caps = load_caps()
+    print("Loading worker stock data...")
+    stock, nat_key = load_worker_stock()
+    print()
     
-    return "\n".join(lines)
+    targets = RESTRICTED_NATIONALITIES if args.all else [{"code": "IRN", "name": "Iran"}]
+    for nationality in targets:
+        analyze_nationality(
+            NATIONALITY_CODES[nationality["code"]],
+            nationality["name"],
+            profs, acts, caps, stock, nat_key, run_at, formats,
+        )
 
 
 if __name__ == "__main__":
-    analyze_iran()
+    main()
@@ -13,10 +13,17 @@ Generates detailed reports with:
 - Cap recommendations
 """
 
+import bisect
 import csv
+import io
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+import pandas as pd
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "real_data"
@@ -37,6 +44,144 @@ ALT_CODES = {
     "050": "Bangladesh",
 }
 
+# Output buffer size for report files (1 MiB, fewer write syscalls)
+WRITE_BUFFER = 1 << 20
+
+# Tier share thresholds (ascending): shares below the first are tier 4,
+# at or above the last tier 1
+TIER_THRESHOLDS = (0.01, 0.05, 0.15)
+
+# Tier status -> share of headroom available to tiers 1-4
+TIER_CAP_MAP = {
+    "OPEN": (0.45, 0.30, 0.15, 0.10),
+    "RATIONED": (0.30, 0.20, 0.10, 0.05),
+    "LIMITED": (0.15, 0.10, 0.05, 0.02),
+    "CLOSED": (0, 0, 0, 0),
+}
+
+# Tier display names used in the report tables
+TIER_NAMES = {
+    1: "Tier 1 (Highest Demand)",
+    2: "Tier 2 (High Demand)",
+    3: "Tier 3 (Moderate)",
+    4: "Tier 4 (Low/Specialized)",
+}
+
+# Dominance alert level -> share threshold (%) it was raised at
+ALERT_THRESHOLDS = {"WATCH": 30, "HIGH": 40, "CRITICAL": 50}
+
+# Utilization status: above 40% is MODERATE, above 70% is HIGH
+UTIL_STATUS_THRESHOLDS = (40, 70)
+UTIL_STATUS_LABELS = ("LOW", "MODERATE", "HIGH")
+
+# Markdown utilization bars, indexed by the number of filled cells (0-40)
+UTIL_BARS_40 = tuple("#" * filled + "-" * (40 - filled) for filled in range(41))
+
+# Markdown report section 2 lead-in: tier system explanation and definitions
+TIER_OVERVIEW_MD = """\
+## 2. Tier Classification Overview
+
+### Understanding the Tier System
+
+The tier system identifies **demand patterns** for each nationality. Since quotas are limited,
+the system uses tiers to **prioritize allocation**:
+
+- **Tier 1 professions get served FIRST** - These are the highest demand jobs
+- **Lower tiers open only when Tier 1 demand is satisfied**
+- This ensures companies needing the most in-demand workers get priority
+
+**Note:** Dominance alerts (30%+) are a SEPARATE check for concentration risk.
+
+### Tier Definitions
+
+| Tier | Name | Share Range | Description | Allocation Priority |
+|------|------|-------------|-------------|---------------------|
+| **Tier 1** | Primary | > 15% | Highest demand professions - most requested jobs for this nationality | **HIGHEST** - Served first |
+| **Tier 2** | Secondary | 5% - 15% | High demand professions with significant request volume | HIGH - Opens when Tier 1 satisfied |
+| **Tier 3** | Minor | 1% - 5% | Moderate demand professions | MEDIUM - Opens when Tier 1+2 satisfied |
+| **Tier 4** | Unusual | < 1% | Low demand / specialized professions | LOW - Opens when capacity available |
+
+"""
+
+# Markdown per-country KPI table, filled from an enriched summary
+KPI_TABLE_MD = """\
+#### Key Performance Indicators
+
+| Metric | Value | Status |
+|--------|-------|--------|
+| Current Stock | {stock:,} | In-Country Workers |
+| Cap (2026) | {cap:,} | Policy Limit |
+| Headroom | {headroom:,} | Available Capacity |
+| Utilization | **{utilization:.1f}%** | {status} |
+| Professions | {num_professions:,} | Diversity Index |
+| Growth Rate | {growth_rate:+.1f}% | 6-Month Trend |
+"""
+
+# Markdown dominance alert threshold reference table
+ALERT_REFERENCE_MD = """\
+### Alert Thresholds Reference
+
+| Level | Threshold | Action |
+|-------|-----------|--------|
+| **WATCH** | 30% - 39% | Monitor trends, consider diversification |
+| **HIGH** | 40% - 49% | Active intervention recommended |
+| **CRITICAL** | 50%+ | Blocking new approvals in that profession |
+
+---
+
+"""
+
+# Markdown appendix: methodology, data sources and report footer
+METHODOLOGY_MD = """\
+## Appendix A: Methodology
+
+### Tier Classification
+
+Professions are classified into tiers based on their share of total workforce, representing **demand patterns**:
+
+- **Tier 1 (Primary):** Share >= 15% - Highest demand jobs, get **priority allocation**
+- **Tier 2 (Secondary):** Share >= 5% and < 15% - High demand, opens when Tier 1 demand satisfied
+- **Tier 3 (Minor):** Share >= 1% and < 5% - Moderate demand
+- **Tier 4 (Unusual):** Share < 1% - Low demand / specialized roles
+
+**Key Principle:** Since nationality quotas are limited, the system prioritizes Tier 1 professions first,
+ensuring companies requesting high-demand jobs get served before lower tiers open.
+
+### Cap Recommendation Algorithm
+
+The AI recommendation engine considers:
+- Current utilization rate
+- Number of active dominance alerts
+- Growth trend (6-month)
+- Workforce diversification
+
+### Data Source
+
+- **File:** D:\\Quota\\real_data\\07_worker_stock.csv
+- **Reference:** 01_nationalities.csv, 02_professions.csv, 05_nationality_caps.csv
+
+---
+
+*End of Report*
+"""
+
+# Worker stock columns used by the analysis
+WORKER_COLUMNS = ["nationality_code", "state", "profession_code", "employment_start", "employment_end"]
+
+# Worker state -> per-nationality counter
+STATE_KEYS = {
+    "IN_COUNTRY": "in_country",
+    "OUT_COUNTRY": "out_country",
+    "COMMITTED": "committed",
+    "PENDING": "pending",
+}
+
+# Worker state -> per-nationality profession counts
+PROF_STATE_KEYS = {
+    "IN_COUNTRY": "professions",
+    "OUT_COUNTRY": "prof_out",
+}
+
 
 def load_csv(filename: str) -> list[dict]:
     """Load CSV file from real_data directory."""
@@ -93,102 +238,126 @@ def load_reference_data():
     return nat_map, prof_map, caps
 
 
-def analyze_workers(target_codes: set, prof_map: dict) -> dict:
-    """Analyze worker stock for target nationalities."""
-    print("Analyzing worker stock data...")
-    
-    results = defaultdict(lambda: {
+def _empty_worker_result() -> dict:
+    """Per-nationality worker counters."""
+    return {
         "in_country": 0,
         "out_country": 0,
         "committed": 0,
         "pending": 0,
         "total": 0,
-        "professions": defaultdict(int),
-        "prof_out": defaultdict(int),
+        "professions": {},
+        "prof_out": {},
         "recent_entries": 0,
         "recent_exits": 0,
-        "employment_years": [],
-    })
+        "emp_years_sum": 0.0,
+        "emp_years_count": 0,
+    }
+
+
+def _clean_column(column: pd.Series, clean) -> pd.Series:
+    """Apply a string cleaner to a categorical column's categories instead of every row."""
+    categories = column.cat.categories
+    return column.map(dict(zip(categories, clean(categories))))
+
+
+def _parse_dates(categories: pd.Index) -> pd.DatetimeIndex:
+    """Parse the YYYY-MM-DD prefix of each distinct date string; unparseable values become NaT."""
+    return pd.to_datetime(categories.str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+
+
+def _broadcast(column: pd.Series, values) -> pd.Series:
+    """Map one value per category back onto the rows of a categorical column."""
+    return pd.Series(np.asarray(values).take(column.cat.codes.to_numpy()), index=column.index)
+
+
+def analyze_workers(target_codes: set, prof_map: dict) -> dict:
+    """Analyze worker stock for target nationalities."""
+    print("Analyzing worker stock data...")
+    
+    results = defaultdict(_empty_worker_result)
     
     filepath = DATA_DIR / "07_worker_stock.csv"
     if not filepath.exists():
         print(f"  [ERROR] Worker stock file not found: {filepath}")
         return results
     
-    six_months_ago = datetime.now() - timedelta(days=180)
-    row_count = 0
-    matched_count = 0
-    
-    with open(filepath, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row_count += 1
-            if row_count % 500000 == 0:
-                print(f"    Processing row {row_count:,}...")
-            
-            # Get nationality code (handle quoted values)
-            nat_code = row.get("nationality_code", "").strip().strip('"')
-            
-            # Check if this is a target nationality
-            if nat_code not in target_codes:
-                continue
-            
-            matched_count += 1
-            state = row.get("state", "").strip().upper()
-            prof_code = row.get("profession_code", "").strip().strip('"')
-            
-            if state == "IN_COUNTRY":
-                results[nat_code]["in_country"] += 1
-                results[nat_code]["professions"][prof_code] += 1
-            elif state == "OUT_COUNTRY":
-                results[nat_code]["out_country"] += 1
-                results[nat_code]["prof_out"][prof_code] += 1
-            elif state == "COMMITTED":
-                results[nat_code]["committed"] += 1
-            elif state == "PENDING":
-                results[nat_code]["pending"] += 1
-            
-            results[nat_code]["total"] += 1
-            
-            # Growth analysis - recent entries/exits
-            emp_start = row.get("employment_start", "")
-            emp_end = row.get("employment_end", "")
-            
-            try:
-                if emp_start:
-                    start_date = datetime.strptime(emp_start[:10], "%Y-%m-%d")
-                    if start_date >= six_months_ago:
-                        results[nat_code]["recent_entries"] += 1
-                    years = (datetime.now() - start_date).days / 365
-                    if 0 < years < 30:
-                        results[nat_code]["employment_years"].append(years)
-            except (ValueError, TypeError):
-                pass
-            
-            try:
-                if emp_end:
-                    end_date = datetime.strptime(emp_end[:10], "%Y-%m-%d")
-                    if end_date >= six_months_ago:
-                        results[nat_code]["recent_exits"] += 1
-            except (ValueError, TypeError):
-                pass
+    now = datetime.now()
+    six_months_ago = now - timedelta(days=180)
+    
+    # Columnar load: only the needed columns, as categoricals so the
+    # strip/upper clean-up runs once per distinct value, not per row
+    stock = pd.read_csv(
+        filepath,
+        usecols=WORKER_COLUMNS,
+        dtype="category",
+        keep_default_na=False,
+        encoding="utf-8-sig",
+    )
+    row_count = len(stock)
+    
+    # Keep target nationalities only. Raw nationality values (quoted, padded...) that canonicalise to a
+    # target code; rows are matched on the raw categorical directly
+    raw_codes = stock["nationality_code"].cat.categories
+    nat_canon = {
+        raw: code
+        for raw, code in zip(raw_codes, raw_codes.str.strip().str.strip('"'))
+        if code in target_codes
+    }
+    matched = stock[stock["nationality_code"].isin(list(nat_canon))]
+    workers = pd.DataFrame({
+        "nat_code": matched["nationality_code"].map(nat_canon),
+        "state": _clean_column(matched["state"], lambda c: c.str.strip().str.upper()),
+        "prof_code": _clean_column(matched["profession_code"], lambda c: c.str.strip().str.strip('"')),
+    })
+    matched_count = len(workers)
+    
+    # Counts by nationality and state, and professions by state; groups
+    # keep first-seen order so ties later sort as the row loop did
+    for nat_code, total in workers.groupby("nat_code", sort=False, observed=True).size().items():
+        results[nat_code]["total"] = int(total)
+    
+    state_counts = workers.groupby(["nat_code", "state"], sort=False, observed=True).size()
+    for (nat_code, state), count in state_counts.items():
+        key = STATE_KEYS.get(state)
+        if key:
+            results[nat_code][key] = int(count)
+    
+    prof_workers = workers[workers["state"].isin(PROF_STATE_KEYS)]
+    prof_counts = prof_workers.groupby(["nat_code", "state", "prof_code"], sort=False, observed=True).size()
+    for (nat_code, state, prof_code), count in prof_counts.items():
+        results[nat_code][PROF_STATE_KEYS[state]][prof_code] = int(count)
+    
+    # Growth analysis - recent entries/exits. Dates are parsed, compared
+    # and turned into tenure once per distinct date, then broadcast to rows
+    start_col = matched["employment_start"]
+    end_col = matched["employment_end"]
+    start_dates = _parse_dates(start_col.cat.categories)
+    end_dates = _parse_dates(end_col.cat.categories)
+    years = _broadcast(start_col, (now - start_dates).days / 365)
+    dates = pd.DataFrame({
+        "nat_code": workers["nat_code"],
+        "recent_entry": _broadcast(start_col, start_dates >= six_months_ago),
+        "recent_exit": _broadcast(end_col, end_dates >= six_months_ago),
+    })
+    recent_counts = dates.groupby("nat_code", sort=False, observed=True).sum()
+    for nat_code, recent in recent_counts.iterrows():
+        results[nat_code]["recent_entries"] = int(recent["recent_entry"])
+        results[nat_code]["recent_exits"] = int(recent["recent_exit"])
+    
+    # Tenure as a running sum and count; only the mean is reported
+    tenure = years[(years > 0) & (years < 30)]
+    tenure_stats = tenure.groupby(
+        workers["nat_code"][tenure.index], sort=False, observed=True
+    ).agg(["sum", "count"])
+    for nat_code, stats in tenure_stats.iterrows():
+        results[nat_code]["emp_years_sum"] = float(stats["sum"])
+        results[nat_code]["emp_years_count"] = int(stats["count"])
     
     print(f"  Processed {row_count:,} records, matched {matched_count:,} for target nationalities")
     return results
 
 
-def calculate_tier(share_pct: float) -> tuple:
-    """Calculate tier level based on share percentage."""
-    if share_pct >= 0.15:
-        return 1, "Primary", ">15%"
-    elif share_pct >= 0.05:
-        return 2, "Secondary", "5-15%"
-    elif share_pct >= 0.01:
-        return 3, "Minor", "1-5%"
-    else:
-        return 4, "Unusual", "<1%"
-
-
 def get_tier_status(utilization: float, tier_level: int) -> str:
     """Determine tier status based on utilization."""
     if utilization > 0.95:
@@ -211,6 +380,11 @@ def get_tier_status(utilization: float, tier_level: int) -> str:
         return "OPEN" if tier_level <= 3 else "RATIONED"
 
 
+def utilization_status(utilization_pct: float) -> str:
+    """Classify a utilization percentage as LOW, MODERATE or HIGH."""
+    return UTIL_STATUS_LABELS[bisect.bisect_left(UTIL_STATUS_THRESHOLDS, utilization_pct)]
+
+
 def analyze_dominance(professions: dict, total: int, prof_map: dict) -> list:
     """Analyze dominance risks by profession."""
     if total == 0:
@@ -280,7 +454,8 @@ def calculate_recommendation(stock: int, cap: int, growth_rate: float, alerts: l
 def generate_country_report(code: str, name: str, data: dict, 
                             cap_info: dict, prof_map: dict) -> tuple:
     """Generate detailed report for a single country."""
-    lines = []
+    buf = io.StringIO()
+    emit = partial(print, file=buf)
     
     # Basic stats
     stock = data["in_country"]
@@ -297,24 +472,35 @@ def generate_country_report(code: str, name: str, data: dict,
     projected_outflow = int(stock * 0.045)
     
     # Average tenure
-    avg_tenure = sum(data["employment_years"]) / len(data["employment_years"]) if data["employment_years"] else 0
+    avg_tenure = data["emp_years_sum"] / data["emp_years_count"] if data["emp_years_count"] else 0
+    
+    # Tier classification: rank professions by count (stable, so ties keep
+    # their original order) and bucket every share into a tier in one pass
+    prof_codes = np.array(list(data["professions"]), dtype=object)
+    prof_counts = np.fromiter(data["professions"].values(), dtype=np.int64, count=len(prof_codes))
+    order = np.argsort(-prof_counts, kind="stable")
+    prof_codes = prof_codes[order]
+    prof_counts = prof_counts[order]
+    shares = prof_counts / stock if stock > 0 else np.zeros(len(prof_counts))
+    tier_levels = len(TIER_THRESHOLDS) + 1 - np.searchsorted(TIER_THRESHOLDS, shares, side="right")
+    
+    level_totals = np.bincount(tier_levels, weights=prof_counts, minlength=5)
+    tier_totals = {level: int(level_totals[level]) for level in (1, 2, 3, 4)}
+    
+    # Only the top few professions per tier are displayed
+    tier_data = {}
+    for level in (1, 2, 3, 4):
+        tier_data[level] = [
+            {
+                "code": prof_codes[i],
+                "name": prof_map.get(prof_codes[i], {}).get("name", f"Unknown ({prof_codes[i]})"),
+                "count": int(prof_counts[i]),
+                "share": float(shares[i]),
+            }
+            for i in np.flatnonzero(tier_levels == level)[:5]
+        ]
     
-    # Tier classification
-    sorted_profs = sorted(data["professions"].items(), key=lambda x: x[1], reverse=True)
-    tier_data = {1: [], 2: [], 3: [], 4: []}
-    tier_totals = {1: 0, 2: 0, 3: 0, 4: 0}
-    
-    for prof_code, count in sorted_profs:
-        share = count / stock if stock > 0 else 0
-        tier_level, tier_name, tier_range = calculate_tier(share)
-        prof_info = prof_map.get(prof_code, {})
-        tier_data[tier_level].append({
-            "code": prof_code,
-            "name": prof_info.get("name", f"Unknown ({prof_code})"),
-            "count": count,
-            "share": share,
-        })
-        tier_totals[tier_level] += count
+    sorted_profs = list(zip(prof_codes[:15], prof_counts[:15].tolist(), tier_levels[:15].tolist()))
     
     # Dominance alerts
     alerts = analyze_dominance(data["professions"], stock, prof_map)
@@ -323,175 +509,166 @@ def generate_country_report(code: str, name: str, data: dict,
     rec = calculate_recommendation(stock, cap, growth_rate, alerts)
     
     # Build report
-    lines.append("=" * 90)
-    lines.append(f"  {name.upper()} - COMPREHENSIVE QUOTA ANALYSIS REPORT")
-    lines.append(f"  Nationality Code: {code}")
-    lines.append(f"  Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"  Data Source: D:\\Quota\\real_data\\07_worker_stock.csv")
-    lines.append("=" * 90)
-    lines.append("")
+    emit("=" * 90)
+    emit(f"  {name.upper()} - COMPREHENSIVE QUOTA ANALYSIS REPORT")
+    emit(f"  Nationality Code: {code}")
+    emit(f"  Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    emit(f"  Data Source: D:\\Quota\\real_data\\07_worker_stock.csv")
+    emit("=" * 90)
+    emit()
     
     # SECTION 1: EXECUTIVE SUMMARY
-    lines.append("-" * 90)
-    lines.append("  SECTION 1: EXECUTIVE SUMMARY")
-    lines.append("-" * 90)
-    lines.append("")
-    lines.append("  KEY PERFORMANCE INDICATORS")
-    lines.append("  +" + "-" * 86 + "+")
-    lines.append(f"  | {'Metric':<35} | {'Value':>22} | {'Status':>20} |")
-    lines.append("  +" + "-" * 86 + "+")
-    lines.append(f"  | {'Annual Cap (2026)':<35} | {cap:>22,} | {'Policy Set':>20} |")
-    lines.append(f"  | {'Current Stock (In-Country)':<35} | {stock:>22,} | {utilization*100:>19.1f}% |")
-    lines.append(f"  | {'Available Headroom':<35} | {headroom:>22,} | {'Capacity':>20} |")
-    lines.append(f"  | {'Out of Country':<35} | {data['out_country']:>22,} | {'Inactive':>20} |")
-    lines.append(f"  | {'Committed/Pending':<35} | {data['committed']+data['pending']:>22,} | {'In Process':>20} |")
-    lines.append(f"  | {'Total Records':<35} | {data['total']:>22,} | {'All States':>20} |")
-    lines.append("  +" + "-" * 86 + "+")
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 1: EXECUTIVE SUMMARY")
+    emit("-" * 90)
+    emit()
+    emit("  KEY PERFORMANCE INDICATORS")
+    emit("  +" + "-" * 86 + "+")
+    emit(f"  | {'Metric':<35} | {'Value':>22} | {'Status':>20} |")
+    emit("  +" + "-" * 86 + "+")
+    emit(f"  | {'Annual Cap (2026)':<35} | {cap:>22,} | {'Policy Set':>20} |")
+    emit(f"  | {'Current Stock (In-Country)':<35} | {stock:>22,} | {utilization*100:>19.1f}% |")
+    emit(f"  | {'Available Headroom':<35} | {headroom:>22,} | {'Capacity':>20} |")
+    emit(f"  | {'Out of Country':<35} | {data['out_country']:>22,} | {'Inactive':>20} |")
+    emit(f"  | {'Committed/Pending':<35} | {data['committed']+data['pending']:>22,} | {'In Process':>20} |")
+    emit(f"  | {'Total Records':<35} | {data['total']:>22,} | {'All States':>20} |")
+    emit("  +" + "-" * 86 + "+")
+    emit()
     
     # Utilization bar
     util_bar_len = 50
     filled = int(min(utilization, 1.0) * util_bar_len)
     bar = "[" + "#" * filled + "-" * (util_bar_len - filled) + "]"
-    lines.append(f"  CAP UTILIZATION: {bar} {utilization*100:.1f}%")
-    lines.append(f"                   0%{' ' * 22}50%{' ' * 21}100%")
-    lines.append("")
+    emit(f"  CAP UTILIZATION: {bar} {utilization*100:.1f}%")
+    emit(f"                   0%{' ' * 22}50%{' ' * 21}100%")
+    emit()
     
     # SECTION 2: WORKFORCE COMPOSITION
-    lines.append("-" * 90)
-    lines.append("  SECTION 2: WORKFORCE COMPOSITION")
-    lines.append("-" * 90)
-    lines.append("")
-    lines.append("  WORKER STATE DISTRIBUTION")
-    lines.append(f"    In Country:      {data['in_country']:>15,}  ({data['in_country']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
-    lines.append(f"    Out of Country:  {data['out_country']:>15,}  ({data['out_country']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
-    lines.append(f"    Committed:       {data['committed']:>15,}  ({data['committed']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
-    lines.append(f"    Pending:         {data['pending']:>15,}  ({data['pending']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
-    lines.append(f"    {'='*45}")
-    lines.append(f"    TOTAL RECORDS:   {data['total']:>15,}")
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 2: WORKFORCE COMPOSITION")
+    emit("-" * 90)
+    emit()
+    emit("  WORKER STATE DISTRIBUTION")
+    emit(f"    In Country:      {data['in_country']:>15,}  ({data['in_country']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
+    emit(f"    Out of Country:  {data['out_country']:>15,}  ({data['out_country']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
+    emit(f"    Committed:       {data['committed']:>15,}  ({data['committed']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
+    emit(f"    Pending:         {data['pending']:>15,}  ({data['pending']/data['total']*100 if data['total'] > 0 else 0:>5.1f}%)")
+    emit(f"    {'='*45}")
+    emit(f"    TOTAL RECORDS:   {data['total']:>15,}")
+    emit()
     
     if avg_tenure > 0:
-        lines.append(f"  AVERAGE EMPLOYMENT TENURE: {avg_tenure:.1f} years")
-        lines.append("")
+        emit(f"  AVERAGE EMPLOYMENT TENURE: {avg_tenure:.1f} years")
+        emit()
     
-    lines.append(f"  UNIQUE PROFESSIONS: {len(data['professions']):,}")
-    lines.append("")
+    emit(f"  UNIQUE PROFESSIONS: {len(data['professions']):,}")
+    emit()
     
     # SECTION 3: TIER CLASSIFICATION
-    lines.append("-" * 90)
-    lines.append("  SECTION 3: TIER CLASSIFICATION & STATUS")
-    lines.append("-" * 90)
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 3: TIER CLASSIFICATION & STATUS")
+    emit("-" * 90)
+    emit()
     
-    lines.append("  TIER SUMMARY")
-    lines.append("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
-    lines.append(f"  | {'Tier':<18} | {'Status':^10} | {'Workers':>13} | {'Share %':>10} | {'Available':>18} |")
-    lines.append("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
+    emit("  TIER SUMMARY")
+    emit("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
+    emit(f"  | {'Tier':<18} | {'Status':^10} | {'Workers':>13} | {'Share %':>10} | {'Available':>18} |")
+    emit("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
     
-    tier_names = {1: "Tier 1 (Highest Demand)", 2: "Tier 2 (High Demand)", 3: "Tier 3 (Moderate)", 4: "Tier 4 (Low/Specialized)"}
     for tier_level in [1, 2, 3, 4]:
         status = get_tier_status(utilization, tier_level)
         tier_share = tier_totals[tier_level] / stock * 100 if stock > 0 else 0
         
         # Calculate capacity for this tier
-        if status == "OPEN":
-            capacity = int(headroom * [0.45, 0.30, 0.15, 0.10][tier_level-1])
-        elif status == "RATIONED":
-            capacity = int(headroom * [0.30, 0.20, 0.10, 0.05][tier_level-1])
-        elif status == "LIMITED":
-            capacity = int(headroom * [0.15, 0.10, 0.05, 0.02][tier_level-1])
-        else:
-            capacity = 0
+        capacity = int(headroom * TIER_CAP_MAP[status][tier_level - 1])
         
-        lines.append(f"  | {tier_names[tier_level]:<18} | {status:^10} | {tier_totals[tier_level]:>13,} | {tier_share:>9.1f}% | {capacity:>18,} |")
+        emit(f"  | {TIER_NAMES[tier_level]:<18} | {status:^10} | {tier_totals[tier_level]:>13,} | {tier_share:>9.1f}% | {capacity:>18,} |")
     
-    lines.append("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
-    lines.append("")
+    emit("  +" + "-" * 20 + "+" + "-" * 12 + "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 20 + "+")
+    emit()
     
     # Top professions per tier
-    lines.append("  TOP PROFESSIONS BY TIER")
-    lines.append("")
+    emit("  TOP PROFESSIONS BY TIER")
+    emit()
     
     for tier_level in [1, 2, 3, 4]:
         tier_name_full = ["Highest Demand (>15%) - Priority Allocation", "High Demand (5-15%)", "Moderate Demand (1-5%)", "Low Demand (<1%)"][tier_level-1]
         tier_profs = tier_data[tier_level][:5]
         
         if tier_profs:
-            lines.append(f"    TIER {tier_level} - {tier_name_full}")
+            emit(f"    TIER {tier_level} - {tier_name_full}")
             for p in tier_profs:
-                lines.append(f"      - {p['name'][:45]:<45} {p['count']:>10,}  ({p['share']*100:>5.1f}%)")
-            lines.append("")
+                emit(f"      - {p['name'][:45]:<45} {p['count']:>10,}  ({p['share']*100:>5.1f}%)")
+            emit()
     
     # SECTION 4: DOMINANT JOBS ANALYSIS
-    lines.append("-" * 90)
-    lines.append("  SECTION 4: DOMINANT JOBS ANALYSIS")
-    lines.append("-" * 90)
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 4: DOMINANT JOBS ANALYSIS")
+    emit("-" * 90)
+    emit()
     
-    lines.append("  TOP 15 PROFESSIONS BY WORKER COUNT")
-    lines.append(f"  {'#':<3} {'Profession':<45} {'Tier':<6} {'Workers':>12} {'Share %':>10}")
-    lines.append("  " + "-" * 80)
+    emit("  TOP 15 PROFESSIONS BY WORKER COUNT")
+    emit(f"  {'#':<3} {'Profession':<45} {'Tier':<6} {'Workers':>12} {'Share %':>10}")
+    emit("  " + "-" * 80)
     
-    for i, (prof_code, count) in enumerate(sorted_profs[:15], 1):
+    for i, (prof_code, count, tier_level) in enumerate(sorted_profs[:15], 1):
         share = count / stock * 100 if stock > 0 else 0
-        tier_level, _, _ = calculate_tier(count / stock if stock > 0 else 0)
         prof_info = prof_map.get(prof_code, {})
         prof_name = prof_info.get("name", f"Unknown ({prof_code})")
-        lines.append(f"  {i:<3} {prof_name[:45]:<45} T{tier_level:<5} {count:>12,} {share:>9.1f}%")
+        emit(f"  {i:<3} {prof_name[:45]:<45} T{tier_level:<5} {count:>12,} {share:>9.1f}%")
     
-    lines.append("")
+    emit()
     
     # SECTION 5: DOMINANCE RISK ASSESSMENT
-    lines.append("-" * 90)
-    lines.append("  SECTION 5: DOMINANCE RISK ASSESSMENT")
-    lines.append("-" * 90)
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 5: DOMINANCE RISK ASSESSMENT")
+    emit("-" * 90)
+    emit()
     
     if alerts:
-        lines.append("  ACTIVE DOMINANCE ALERTS")
-        lines.append("")
+        emit("  ACTIVE DOMINANCE ALERTS")
+        emit()
         
         for alert in alerts:
             level = alert["level"]
             icon = {"CRITICAL": "[!!!]", "HIGH": "[!!]", "WATCH": "[!]"}.get(level, "[?]")
             blocking = " ** BLOCKING NEW APPROVALS **" if alert["is_blocking"] else ""
             
-            lines.append(f"    {icon} {level} ALERT{blocking}")
-            lines.append(f"        Profession: {alert['name']}")
-            lines.append(f"        Share:      {alert['share']*100:.1f}% ({alert['count']:,} workers)")
-            lines.append(f"        Threshold:  {'50%' if level == 'CRITICAL' else '40%' if level == 'HIGH' else '30%'}")
-            lines.append("")
+            emit(f"    {icon} {level} ALERT{blocking}")
+            emit(f"        Profession: {alert['name']}")
+            emit(f"        Share:      {alert['share']*100:.1f}% ({alert['count']:,} workers)")
+            emit(f"        Threshold:  {ALERT_THRESHOLDS[level]}%")
+            emit()
         
-        lines.append("  DOMINANCE THRESHOLDS:")
-        lines.append("    - WATCH:    30-40% share in profession")
-        lines.append("    - HIGH:     40-50% share (partial approval only)")
-        lines.append("    - CRITICAL: >50% share (blocks new approvals)")
+        emit("  DOMINANCE THRESHOLDS:")
+        emit("    - WATCH:    30-40% share in profession")
+        emit("    - HIGH:     40-50% share (partial approval only)")
+        emit("    - CRITICAL: >50% share (blocks new approvals)")
     else:
-        lines.append("  [OK] No active dominance alerts")
-        lines.append("  All professions are below the 30% concentration threshold.")
+        emit("  [OK] No active dominance alerts")
+        emit("  All professions are below the 30% concentration threshold.")
     
-    lines.append("")
+    emit()
     
     # SECTION 6: GROWTH ANALYSIS
-    lines.append("-" * 90)
-    lines.append("  SECTION 6: GROWTH ANALYSIS & PROJECTIONS")
-    lines.append("-" * 90)
-    lines.append("")
-    
-    lines.append("  6-MONTH TREND ANALYSIS")
-    lines.append(f"    New Entries:         {data['recent_entries']:>15,}")
-    lines.append(f"    Exits:               {data['recent_exits']:>15,}")
-    lines.append(f"    Net Change:          {net_change:>+15,}")
-    lines.append(f"    Growth Rate:         {growth_rate*100:>+14.2f}%")
-    lines.append("")
-    
-    lines.append("  12-MONTH PROJECTIONS")
-    lines.append(f"    Projected Growth:    {projected_annual:>+15,}")
-    lines.append(f"    Projected Stock:     {projected_stock:>15,}")
-    lines.append(f"    Projected Headroom:  {cap - projected_stock:>15,}")
-    lines.append(f"    Projected Util.:     {projected_stock/cap*100 if cap > 0 else 0:>14.1f}%")
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 6: GROWTH ANALYSIS & PROJECTIONS")
+    emit("-" * 90)
+    emit()
+    
+    emit("  6-MONTH TREND ANALYSIS")
+    emit(f"    New Entries:         {data['recent_entries']:>15,}")
+    emit(f"    Exits:               {data['recent_exits']:>15,}")
+    emit(f"    Net Change:          {net_change:>+15,}")
+    emit(f"    Growth Rate:         {growth_rate*100:>+14.2f}%")
+    emit()
+    
+    emit("  12-MONTH PROJECTIONS")
+    emit(f"    Projected Growth:    {projected_annual:>+15,}")
+    emit(f"    Projected Stock:     {projected_stock:>15,}")
+    emit(f"    Projected Headroom:  {cap - projected_stock:>15,}")
+    emit(f"    Projected Util.:     {projected_stock/cap*100 if cap > 0 else 0:>14.1f}%")
+    emit()
     
     # Growth trend indicator
     if growth_rate > 0.02:
@@ -501,71 +678,86 @@ def generate_country_report(code: str, name: str, data: dict,
     else:
         trend = "STABLE - Minor fluctuations"
     
-    lines.append(f"  TREND: {trend}")
-    lines.append("")
+    emit(f"  TREND: {trend}")
+    emit()
     
     # SECTION 7: CAP RECOMMENDATION
-    lines.append("-" * 90)
-    lines.append("  SECTION 7: AI CAP RECOMMENDATION")
-    lines.append("-" * 90)
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 7: AI CAP RECOMMENDATION")
+    emit("-" * 90)
+    emit()
     
-    lines.append("  CAP OPTIONS ANALYSIS")
-    lines.append("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
-    lines.append(f"  | {'Option':<20} | {'Cap Value':>16} | {'Change':>16} | {'Growth':>16} |")
-    lines.append("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
+    emit("  CAP OPTIONS ANALYSIS")
+    emit("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
+    emit(f"  | {'Option':<20} | {'Cap Value':>16} | {'Change':>16} | {'Growth':>16} |")
+    emit("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
     
     for opt_name, opt_val in [("Conservative (+5%)", rec["conservative"]), 
                                ("Moderate (+10%)", rec["moderate"]),
                                ("Flexible (+20%)", rec["flexible"])]:
         change = opt_val - cap
         pct = change / cap * 100 if cap > 0 else 0
-        lines.append(f"  | {opt_name:<20} | {opt_val:>16,} | {change:>+16,} | {pct:>+15.1f}% |")
+        emit(f"  | {opt_name:<20} | {opt_val:>16,} | {change:>+16,} | {pct:>+15.1f}% |")
     
-    lines.append("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
-    lines.append("")
+    emit("  +" + "-" * 22 + "+" + "-" * 18 + "+" + "-" * 18 + "+" + "-" * 18 + "+")
+    emit()
     
-    lines.append(f"  >>> RECOMMENDED: {rec['level'].upper()} - {rec['recommended']:,} <<<")
-    lines.append("")
+    emit(f"  >>> RECOMMENDED: {rec['level'].upper()} - {rec['recommended']:,} <<<")
+    emit()
     
     # Rationale
-    lines.append("  RECOMMENDATION RATIONALE:")
+    emit("  RECOMMENDATION RATIONALE:")
     if rec["level"] == "conservative":
-        lines.append(f"    A conservative cap increase is recommended due to:")
-        lines.append(f"    - {len(alerts)} active dominance alert(s)")
-        lines.append(f"    - Current utilization: {rec['utilization']*100:.1f}%")
-        lines.append("    - Need to maintain workforce diversification")
+        emit(f"    A conservative cap increase is recommended due to:")
+        emit(f"    - {len(alerts)} active dominance alert(s)")
+        emit(f"    - Current utilization: {rec['utilization']*100:.1f}%")
+        emit("    - Need to maintain workforce diversification")
     elif rec["level"] == "flexible":
-        lines.append(f"    A flexible cap increase is recommended due to:")
-        lines.append(f"    - No concentration risks ({len(alerts)} alerts)")
-        lines.append(f"    - Low utilization: {rec['utilization']*100:.1f}%")
-        lines.append("    - Room for growth to meet market demand")
+        emit(f"    A flexible cap increase is recommended due to:")
+        emit(f"    - No concentration risks ({len(alerts)} alerts)")
+        emit(f"    - Low utilization: {rec['utilization']*100:.1f}%")
+        emit("    - Room for growth to meet market demand")
     else:
-        lines.append(f"    A moderate cap increase is recommended to:")
-        lines.append(f"    - Balance growth with risk management")
-        lines.append(f"    - Accommodate projected demand")
-        lines.append(f"    - Current utilization: {rec['utilization']*100:.1f}%")
+        emit(f"    A moderate cap increase is recommended to:")
+        emit(f"    - Balance growth with risk management")
+        emit(f"    - Accommodate projected demand")
+        emit(f"    - Current utilization: {rec['utilization']*100:.1f}%")
     
-    lines.append("")
+    emit()
     
     # Cap history
-    lines.append("-" * 90)
-    lines.append("  SECTION 8: CAP HISTORY")
-    lines.append("-" * 90)
-    lines.append("")
+    emit("-" * 90)
+    emit("  SECTION 8: CAP HISTORY")
+    emit("-" * 90)
+    emit()
     
     cap_change = cap - prev_cap
     cap_pct = cap_change / prev_cap * 100 if prev_cap > 0 else 0
     
-    lines.append(f"    2026 Cap:     {cap:>15,}")
-    lines.append(f"    2025 Cap:     {prev_cap:>15,}")
-    lines.append(f"    YoY Change:   {cap_change:>+15,} ({cap_pct:+.1f}%)")
-    lines.append("")
-    
-    lines.append("=" * 90)
-    lines.append("  END OF REPORT")
-    lines.append("=" * 90)
-    lines.append("")
+    emit(f"    2026 Cap:     {cap:>15,}")
+    emit(f"    2025 Cap:     {prev_cap:>15,}")
+    emit(f"    YoY Change:   {cap_change:>+15,} ({cap_pct:+.1f}%)")
+    emit()
+    
+    emit("=" * 90)
+    emit("  END OF REPORT")
+    emit("=" * 90)
+    
+    # Top professions for the summaries, also grouped by tier so the
+    # summary reports can look a tier up instead of filtering
+    top_profs = [
+        {
+            "code": pc,
+            "name": prof_map.get(pc, {}).get("name", f"Unknown ({pc})"),
+            "count": cnt,
+            "share": cnt / stock if stock > 0 else 0,
+            "tier": tier,
+        }
+        for pc, cnt, tier in sorted_profs[:10]
+    ]
+    tier_buckets = {1: [], 2: [], 3: [], 4: []}
+    for p in top_profs:
+        tier_buckets[p["tier"]].append(p)
     
     # Summary data for executive summary
     summary = {
@@ -582,21 +774,13 @@ def generate_country_report(code: str, name: str, data: dict,
         "alert_count": len(alerts),
         "alerts": alerts,
         "tier_totals": tier_totals,
-        "top_profs": [
-            {
-                "code": pc,
-                "name": prof_map.get(pc, {}).get("name", f"Unknown ({pc})"),
-                "count": cnt,
-                "share": cnt / stock if stock > 0 else 0,
-                "tier": calculate_tier(cnt / stock if stock > 0 else 0)[0],
-            }
-            for pc, cnt in sorted_profs[:10]
-        ],
+        "top_profs": top_profs,
+        "tier_buckets": tier_buckets,
         "rec_level": rec["level"].title(),
         "recommended": rec["recommended"],
     }
     
-    return "\n".join(lines), summary
+    return buf.getvalue(), summary
 
 
 def generate_executive_summary(summary_data: list) -> str:
@@ -643,7 +827,7 @@ def generate_executive_summary(summary_data: list) -> str:
         bar_len = 40
         filled = int(min(s["utilization"] / 100, 1.0) * bar_len)
         bar = "[" + "#" * filled + "-" * (bar_len - filled) + "]"
-        status = "HIGH" if s["utilization"] > 70 else "MODERATE" if s["utilization"] > 40 else "LOW"
+        status = utilization_status(s["utilization"])
         lines.append(f"  {i}. {s['name']:<12} {bar} {s['utilization']:>6.1f}% ({status})")
     
     lines.append("")
@@ -655,7 +839,7 @@ def generate_executive_summary(summary_data: list) -> str:
     lines.append("")
     
     for s in summary_data:
-        tier1 = [p for p in s["top_profs"] if p["tier"] == 1]
+        tier1 = s["tier_buckets"][1]
         if tier1:
             lines.append(f"  {s['name']}:")
             for p in tier1:
@@ -735,69 +919,70 @@ def main():
     worker_data = analyze_workers(target_codes, prof_map)
     print()
     
-    # Generate reports
-    all_reports = []
+    # Generate reports, writing each one (and its part of the combined
+    # report) as soon as it is built instead of holding them all
     summary_data = []
+    combined_path = REPORT_DIR / "qvc_comprehensive_all_countries_2026.txt"
     
-    for code, name in QVC_COUNTRIES.items():
-        print(f"Generating report for {name}...")
-        
-        # Get data (try different code formats)
-        data = worker_data.get(code)
-        if not data or data["in_country"] == 0:
-            data = worker_data.get(code.zfill(3))
-            if data and data["in_country"] > 0:
-                code = code.zfill(3)
-        
-        if not data or data["in_country"] == 0:
-            print(f"  [WARN] No data found for {name} (code {code})")
-            continue
-        
-        # Get cap info
-        cap_info = caps.get(code) or caps.get(code.zfill(3)) or {"cap_limit": 0, "previous_cap": 0}
-        
-        # Generate report
-        report, summary = generate_country_report(code, name, data, cap_info, prof_map)
-        all_reports.append(report)
-        summary_data.append(summary)
-        
-        print(f"  Stock: {summary['stock']:,} | Cap: {summary['cap']:,} | Util: {summary['utilization']:.1f}%")
+    with open(combined_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as combined:
+        for code, name in QVC_COUNTRIES.items():
+            print(f"Generating report for {name}...")
+            
+            # Get data (try different code formats)
+            data = worker_data.get(code)
+            if not data or data["in_country"] == 0:
+                data = worker_data.get(code.zfill(3))
+                if data and data["in_country"] > 0:
+                    code = code.zfill(3)
+            
+            if not data or data["in_country"] == 0:
+                print(f"  [WARN] No data found for {name} (code {code})")
+                continue
+            
+            # Get cap info
+            cap_info = caps.get(code) or caps.get(code.zfill(3)) or {"cap_limit": 0, "previous_cap": 0}
+            
+            # Generate report
+            report, summary = generate_country_report(code, name, data, cap_info, prof_map)
+            summary_data.append(summary)
+            
+            print(f"  Stock: {summary['stock']:,} | Cap: {summary['cap']:,} | Util: {summary['utilization']:.1f}%")
+            
+            # Individual report
+            filename = f"qvc_comprehensive_{name.lower().replace(' ', '_')}_2026.txt"
+            with open(REPORT_DIR / filename, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+                f.write(report)
+            print(f"  Saved: {filename}")
+            
+            # Combined report (reports separated by a blank line)
+            if len(summary_data) > 1:
+                combined.write("\n\n")
+            combined.write(report)
+            
+            # Release this country's counters before building the next report
+            del worker_data[code]
+    
+    print(f"  Saved: {combined_path.name}")
     
     # Generate executive summary
     print()
     print("Generating executive summary...")
     exec_summary = generate_executive_summary(summary_data)
     
-    # Write reports
+    # Write remaining reports
     print()
     print("Writing reports...")
     
-    # Individual reports
-    for report, summary in zip(all_reports, summary_data):
-        filename = f"qvc_comprehensive_{summary['name'].lower().replace(' ', '_')}_2026.txt"
-        filepath = REPORT_DIR / filename
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(report)
-        print(f"  Saved: {filename}")
-    
-    # Combined report
-    combined = "\n\n".join(all_reports)
-    combined_path = REPORT_DIR / "qvc_comprehensive_all_countries_2026.txt"
-    with open(combined_path, "w", encoding="utf-8") as f:
-        f.write(combined)
-    print(f"  Saved: qvc_comprehensive_all_countries_2026.txt")
-    
     # Executive summary
     summary_path = REPORT_DIR / "qvc_comprehensive_executive_summary_2026.txt"
-    with open(summary_path, "w", encoding="utf-8") as f:
+    with open(summary_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
         f.write(exec_summary)
     print(f"  Saved: qvc_comprehensive_executive_summary_2026.txt")
     
     # Markdown report
-    md_report = generate_markdown_report(summary_data, all_reports)
     md_path = REPORT_DIR / "QVC_Countries_Comprehensive_Analysis_2026.md"
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(md_report)
+    with open(md_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        generate_markdown_report(f, summary_data)
     print(f"  Saved: QVC_Countries_Comprehensive_Analysis_2026.md")
     
     print()
@@ -811,313 +996,274 @@ def main():
     print(exec_summary)
 
 
-def generate_markdown_report(summary_data: list, all_reports: list) -> str:
-    """Generate comprehensive Markdown report."""
-    lines = []
-    
-    lines.append("# QVC Countries Comprehensive Analysis Report 2026")
-    lines.append("")
-    lines.append(f"**Report Generated:** {datetime.now().strftime('%B %d, %Y')}  ")
-    lines.append("**Data Source:** D:\\Quota\\real_data\\07_worker_stock.csv  ")
-    lines.append("**Countries Analyzed:** India, Bangladesh, Nepal, Pakistan, Philippines, Sri Lanka")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+def _enrich_summaries(summary_data: list) -> list:
+    """
+    Add the derived fields the Markdown report reads in several sections.
+    
+    Returns copies of the summaries with status, util_bar, alert_str and
+    cap_change filled in, so each is computed once per country.
+    """
+    enriched = []
+    for s in summary_data:
+        util = s["utilization"]
+        enriched.append({
+            **s,
+            "status": utilization_status(util),
+            "util_bar": UTIL_BARS_40[int(min(util / 100, 1.0) * 40)],
+            "alert_str": f"**{s['alert_count']}**" if s["alert_count"] > 0 else "0",
+            "cap_change": s["recommended"] - s["cap"],
+        })
+    return enriched
+
+
+def generate_markdown_report(out: TextIO, summary_data: list) -> None:
+    """
+    Write the comprehensive Markdown report.
+    
+    Args:
+        out: Open text stream the report is written to
+        summary_data: Per-country summaries from generate_country_report
+    """
+    emit = partial(print, file=out)
+    summary_data = _enrich_summaries(summary_data)
+    
+    emit("# QVC Countries Comprehensive Analysis Report 2026")
+    emit()
+    emit(f"**Report Generated:** {datetime.now().strftime('%B %d, %Y')}  ")
+    emit("**Data Source:** D:\\Quota\\real_data\\07_worker_stock.csv  ")
+    emit("**Countries Analyzed:** India, Bangladesh, Nepal, Pakistan, Philippines, Sri Lanka")
+    emit()
+    emit("---")
+    emit()
     
     # Executive Summary
-    lines.append("## Executive Summary")
-    lines.append("")
+    emit("## Executive Summary")
+    emit()
     
-    total_stock = sum(s["stock"] for s in summary_data)
-    total_cap = sum(s["cap"] for s in summary_data)
-    total_alerts = sum(s["alert_count"] for s in summary_data)
-    
-    lines.append("### Key Metrics at a Glance")
-    lines.append("")
-    lines.append("| Metric | Value |")
-    lines.append("|--------|-------|")
-    lines.append(f"| **Total Current Stock** | {total_stock:,} |")
-    lines.append(f"| **Total Cap Allocation** | {total_cap:,} |")
-    lines.append(f"| **Total Headroom** | {total_cap - total_stock:,} |")
-    lines.append(f"| **Overall Utilization** | {total_stock/total_cap*100:.1f}% |")
-    lines.append(f"| **Active Dominance Alerts** | {total_alerts} |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    # Totals, utilization extremes and diversification buckets in one pass
+    total_stock = total_cap = total_alerts = total_recommended = 0
+    highest_util = lowest_util = None
+    diversified, moderate, concentrated = [], [], []
+    for s in summary_data:
+        total_stock += s["stock"]
+        total_cap += s["cap"]
+        total_alerts += s["alert_count"]
+        total_recommended += s["recommended"]
+        if highest_util is None or s["utilization"] > highest_util["utilization"]:
+            highest_util = s
+        if lowest_util is None or s["utilization"] < lowest_util["utilization"]:
+            lowest_util = s
+        tier1 = s["tier_buckets"][1]
+        if not tier1:
+            diversified.append(s["name"])
+        if any(p["share"] < 0.30 for p in tier1):
+            moderate.append(s["name"])
+        if any(p["share"] >= 0.30 for p in tier1):
+            concentrated.append(s["name"])
+    
+    total_headroom = total_cap - total_stock
+    
+    emit("### Key Metrics at a Glance")
+    emit()
+    emit("| Metric | Value |")
+    emit("|--------|-------|")
+    emit(f"| **Total Current Stock** | {total_stock:,} |")
+    emit(f"| **Total Cap Allocation** | {total_cap:,} |")
+    emit(f"| **Total Headroom** | {total_headroom:,} |")
+    emit(f"| **Overall Utilization** | {total_stock/total_cap*100:.1f}% |")
+    emit(f"| **Active Dominance Alerts** | {total_alerts} |")
+    emit()
+    emit("---")
+    emit()
     
     # Comparative Analysis
-    lines.append("## 1. Comparative Analysis by Country")
-    lines.append("")
-    lines.append("| Country | Stock | Cap | Headroom | Util % | Growth | Alerts | Rec Cap |")
-    lines.append("|---------|-------|-----|----------|--------|--------|--------|---------|")
+    emit("## 1. Comparative Analysis by Country")
+    emit()
+    emit("| Country | Stock | Cap | Headroom | Util % | Growth | Alerts | Rec Cap |")
+    emit("|---------|-------|-----|----------|--------|--------|--------|---------|")
     
-    for s in summary_data:
-        alert_str = f"**{s['alert_count']}**" if s['alert_count'] > 0 else "0"
-        lines.append(f"| **{s['name']}** | {s['stock']:,} | {s['cap']:,} | {s['headroom']:,} | {s['utilization']:.1f}% | {s['growth_rate']:+.1f}% | {alert_str} | {s['recommended']:,} |")
+    out.writelines([
+        f"| **{s['name']}** | {s['stock']:,} | {s['cap']:,} | {s['headroom']:,} | {s['utilization']:.1f}% | {s['growth_rate']:+.1f}% | {s['alert_str']} | {s['recommended']:,} |\n"
+        for s in summary_data
+    ])
     
-    lines.append(f"| **TOTAL** | **{total_stock:,}** | **{total_cap:,}** | **{total_cap-total_stock:,}** | **{total_stock/total_cap*100:.1f}%** | - | **{total_alerts}** | - |")
-    lines.append("")
+    emit(f"| **TOTAL** | **{total_stock:,}** | **{total_cap:,}** | **{total_headroom:,}** | **{total_stock/total_cap*100:.1f}%** | - | **{total_alerts}** | - |")
+    emit()
     
     # Utilization Ranking
-    lines.append("### Utilization Ranking")
-    lines.append("")
-    lines.append("```")
+    emit("### Utilization Ranking")
+    emit()
+    emit("```")
     sorted_by_util = sorted(summary_data, key=lambda x: x["utilization"], reverse=True)
     for i, s in enumerate(sorted_by_util, 1):
-        bar_len = 40
-        filled = int(min(s["utilization"] / 100, 1.0) * bar_len)
-        bar = "#" * filled + "-" * (bar_len - filled)
-        status = "HIGH" if s["utilization"] > 70 else "MODERATE" if s["utilization"] > 40 else "LOW"
-        lines.append(f"{i}. {s['name']:<12} [{bar}] {s['utilization']:>6.1f}% ({status})")
-    lines.append("```")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+        emit(f"{i}. {s['name']:<12} [{s['util_bar']}] {s['utilization']:>6.1f}% ({s['status']})")
+    emit("```")
+    emit()
+    emit("---")
+    emit()
     
     # Tier Classification Overview
-    lines.append("## 2. Tier Classification Overview")
-    lines.append("")
-    lines.append("### Understanding the Tier System")
-    lines.append("")
-    lines.append("The tier system identifies **demand patterns** for each nationality. Since quotas are limited,")
-    lines.append("the system uses tiers to **prioritize allocation**:")
-    lines.append("")
-    lines.append("- **Tier 1 professions get served FIRST** - These are the highest demand jobs")
-    lines.append("- **Lower tiers open only when Tier 1 demand is satisfied**")
-    lines.append("- This ensures companies needing the most in-demand workers get priority")
-    lines.append("")
-    lines.append("**Note:** Dominance alerts (30%+) are a SEPARATE check for concentration risk.")
-    lines.append("")
-    lines.append("### Tier Definitions")
-    lines.append("")
-    lines.append("| Tier | Name | Share Range | Description | Allocation Priority |")
-    lines.append("|------|------|-------------|-------------|---------------------|")
-    lines.append("| **Tier 1** | Primary | > 15% | Highest demand professions - most requested jobs for this nationality | **HIGHEST** - Served first |")
-    lines.append("| **Tier 2** | Secondary | 5% - 15% | High demand professions with significant request volume | HIGH - Opens when Tier 1 satisfied |")
-    lines.append("| **Tier 3** | Minor | 1% - 5% | Moderate demand professions | MEDIUM - Opens when Tier 1+2 satisfied |")
-    lines.append("| **Tier 4** | Unusual | < 1% | Low demand / specialized professions | LOW - Opens when capacity available |")
-    lines.append("")
+    out.write(TIER_OVERVIEW_MD)
     
     # Tier 1 professions
-    lines.append("### Tier 1 (Primary) Professions by Country - HIGHEST DEMAND JOBS")
-    lines.append("")
-    lines.append("These are the **highest demand professions** for each nationality. Companies requesting these jobs get **priority allocation**.")
-    lines.append("")
-    lines.append("| Country | Profession | Workers | Share % | Allocation Priority | Dominance Status |")
-    lines.append("|---------|------------|---------|---------|---------------------|------------------|")
+    emit("### Tier 1 (Primary) Professions by Country - HIGHEST DEMAND JOBS")
+    emit()
+    emit("These are the **highest demand professions** for each nationality. Companies requesting these jobs get **priority allocation**.")
+    emit()
+    emit("| Country | Profession | Workers | Share % | Allocation Priority | Dominance Status |")
+    emit("|---------|------------|---------|---------|---------------------|------------------|")
     
     has_tier1 = False
     for s in summary_data:
-        tier1 = [p for p in s["top_profs"] if p["tier"] == 1]
+        tier1 = s["tier_buckets"][1]
         if tier1:
             has_tier1 = True
-            for p in tier1:
-                dom_status = "WATCH (>30%)" if p["share"] >= 0.30 else "OK"
-                lines.append(f"| **{s['name']}** | {p['name'][:30]} | {p['count']:,} | **{p['share']*100:.1f}%** | **HIGHEST** | {dom_status} |")
+            out.writelines([
+                f"| **{s['name']}** | {p['name'][:30]} | {p['count']:,} | **{p['share']*100:.1f}%** | **HIGHEST** | {'WATCH (>30%)' if p['share'] >= 0.30 else 'OK'} |\n"
+                for p in tier1
+            ])
         else:
-            lines.append(f"| {s['name']} | *No single profession >15%* | - | - | Distributed | *Diversified* |")
+            emit(f"| {s['name']} | *No single profession >15%* | - | - | Distributed | *Diversified* |")
     
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit()
+    emit("---")
+    emit()
     
     # Individual Country Analysis
-    lines.append("## 3. Individual Country Analysis")
-    lines.append("")
+    emit("## 3. Individual Country Analysis")
+    emit()
     
     for s in summary_data:
-        lines.append(f"### {s['name'].upper()}")
-        lines.append("")
-        lines.append("#### Key Performance Indicators")
-        lines.append("")
-        lines.append("| Metric | Value | Status |")
-        lines.append("|--------|-------|--------|")
-        lines.append(f"| Current Stock | {s['stock']:,} | In-Country Workers |")
-        lines.append(f"| Cap (2026) | {s['cap']:,} | Policy Limit |")
-        lines.append(f"| Headroom | {s['headroom']:,} | Available Capacity |")
-        lines.append(f"| Utilization | **{s['utilization']:.1f}%** | {'HIGH' if s['utilization'] > 70 else 'MODERATE' if s['utilization'] > 40 else 'LOW'} |")
-        lines.append(f"| Professions | {s['num_professions']:,} | Diversity Index |")
-        lines.append(f"| Growth Rate | {s['growth_rate']:+.1f}% | 6-Month Trend |")
-        lines.append("")
+        emit(f"### {s['name'].upper()}")
+        emit()
+        out.write(KPI_TABLE_MD.format_map(s))
+        emit()
         
         # Utilization bar
-        util_bar_len = 40
-        filled = int(min(s["utilization"] / 100, 1.0) * util_bar_len)
-        bar = "#" * filled + "-" * (util_bar_len - filled)
-        lines.append("#### Utilization")
-        lines.append(f"```")
-        lines.append(f"[{bar}] {s['utilization']:.1f}%")
-        lines.append("```")
-        lines.append("")
+        emit("#### Utilization")
+        emit(f"```")
+        emit(f"[{s['util_bar']}] {s['utilization']:.1f}%")
+        emit("```")
+        emit()
         
         # Tier distribution
-        lines.append("#### Tier Distribution")
-        lines.append("")
-        lines.append("| Tier | Workers | Share % |")
-        lines.append("|------|---------|---------|")
+        emit("#### Tier Distribution")
+        emit()
+        emit("| Tier | Workers | Share % |")
+        emit("|------|---------|---------|")
         for tier in [1, 2, 3, 4]:
-            tier_names = {1: "Tier 1 (Highest Demand)", 2: "Tier 2 (High Demand)", 3: "Tier 3 (Moderate)", 4: "Tier 4 (Low/Specialized)"}
             tier_count = s["tier_totals"].get(tier, 0)
             tier_share = tier_count / s["stock"] * 100 if s["stock"] > 0 else 0
-            lines.append(f"| {tier_names[tier]} | {tier_count:,} | {tier_share:.1f}% |")
-        lines.append("")
+            emit(f"| {TIER_NAMES[tier]} | {tier_count:,} | {tier_share:.1f}% |")
+        emit()
         
         # Top 10 professions
-        lines.append("#### Top 10 Professions")
-        lines.append("")
-        lines.append("| # | Profession | Tier | Workers | Share % |")
-        lines.append("|---|------------|------|---------|---------|")
-        for i, p in enumerate(s["top_profs"][:10], 1):
-            lines.append(f"| {i} | {p['name'][:35]} | T{p['tier']} | {p['count']:,} | {p['share']*100:.1f}% |")
-        lines.append("")
+        emit("#### Top 10 Professions")
+        emit()
+        emit("| # | Profession | Tier | Workers | Share % |")
+        emit("|---|------------|------|---------|---------|")
+        out.writelines([
+            f"| {i} | {p['name'][:35]} | T{p['tier']} | {p['count']:,} | {p['share']*100:.1f}% |\n"
+            for i, p in enumerate(s["top_profs"][:10], 1)
+        ])
+        emit()
         
         # Dominance assessment
-        lines.append("#### Dominance Risk Assessment")
+        emit("#### Dominance Risk Assessment")
         if s["alerts"]:
             for alert in s["alerts"]:
-                lines.append(f"")
-                lines.append(f"> **{alert['level']} ALERT**")
-                lines.append(f"> ")
-                lines.append(f"> **Profession:** {alert['name']}  ")
-                lines.append(f"> **Share:** {alert['share']*100:.1f}%  ")
-                lines.append(f"> **Status:** Exceeds {30 if alert['level'] == 'WATCH' else 40 if alert['level'] == 'HIGH' else 50}% threshold  ")
+                emit()
+                emit(f"> **{alert['level']} ALERT**")
+                emit(f"> ")
+                emit(f"> **Profession:** {alert['name']}  ")
+                emit(f"> **Share:** {alert['share']*100:.1f}%  ")
+                emit(f"> **Status:** Exceeds {ALERT_THRESHOLDS[alert['level']]}% threshold  ")
         else:
-            lines.append("**Status:** No active alerts  ")
-            lines.append("All professions are below the 30% concentration threshold.")
-        lines.append("")
+            emit("**Status:** No active alerts  ")
+            emit("All professions are below the 30% concentration threshold.")
+        emit()
         
         # Cap recommendation
-        lines.append("#### Cap Recommendation")
-        lines.append(f"- **Current Cap:** {s['cap']:,}")
-        lines.append(f"- **Recommended:** {s['recommended']:,} ({s['rec_level']})")
-        lines.append(f"- **Change:** {s['recommended'] - s['cap']:+,}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        emit("#### Cap Recommendation")
+        emit(f"- **Current Cap:** {s['cap']:,}")
+        emit(f"- **Recommended:** {s['recommended']:,} ({s['rec_level']})")
+        emit(f"- **Change:** {s['cap_change']:+,}")
+        emit()
+        emit("---")
+        emit()
     
     # Dominance Alerts Summary
-    lines.append("## 4. Dominance Alerts Summary")
-    lines.append("")
+    emit("## 4. Dominance Alerts Summary")
+    emit()
     
     has_alerts = any(s["alerts"] for s in summary_data)
     if has_alerts:
-        lines.append("### Active Alerts")
-        lines.append("")
-        lines.append("| Country | Profession | Share % | Alert Level | Action |")
-        lines.append("|---------|------------|---------|-------------|--------|")
+        emit("### Active Alerts")
+        emit()
+        emit("| Country | Profession | Share % | Alert Level | Action |")
+        emit("|---------|------------|---------|-------------|--------|")
         
-        for s in summary_data:
-            for alert in s["alerts"]:
-                lines.append(f"| **{s['name']}** | {alert['name'][:30]} | **{alert['share']*100:.1f}%** | {alert['level']} | Monitor closely |")
+        out.writelines([
+            f"| **{s['name']}** | {alert['name'][:30]} | **{alert['share']*100:.1f}%** | {alert['level']} | Monitor closely |\n"
+            for s in summary_data
+            for alert in s["alerts"]
+        ])
         
-        lines.append("")
+        emit()
     else:
-        lines.append("**[OK] No active dominance alerts across all QVC countries.**")
-        lines.append("")
+        emit("**[OK] No active dominance alerts across all QVC countries.**")
+        emit()
     
-    lines.append("### Alert Thresholds Reference")
-    lines.append("")
-    lines.append("| Level | Threshold | Action |")
-    lines.append("|-------|-----------|--------|")
-    lines.append("| **WATCH** | 30% - 39% | Monitor trends, consider diversification |")
-    lines.append("| **HIGH** | 40% - 49% | Active intervention recommended |")
-    lines.append("| **CRITICAL** | 50%+ | Blocking new approvals in that profession |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    out.write(ALERT_REFERENCE_MD)
     
     # Cap Recommendations Summary
-    lines.append("## 5. Cap Recommendations Summary")
-    lines.append("")
-    lines.append("| Country | Current Cap | Recommended | Change | Level |")
-    lines.append("|---------|-------------|-------------|--------|-------|")
-    
-    total_current = 0
-    total_recommended = 0
-    
-    for s in summary_data:
-        change = s["recommended"] - s["cap"]
-        total_current += s["cap"]
-        total_recommended += s["recommended"]
-        lines.append(f"| **{s['name']}** | {s['cap']:,} | {s['recommended']:,} | {change:+,} | {s['rec_level']} |")
-    
-    lines.append(f"| **TOTAL** | **{total_current:,}** | **{total_recommended:,}** | **{total_recommended - total_current:+,}** | - |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit("## 5. Cap Recommendations Summary")
+    emit()
+    emit("| Country | Current Cap | Recommended | Change | Level |")
+    emit("|---------|-------------|-------------|--------|-------|")
+    
+    out.writelines([
+        f"| **{s['name']}** | {s['cap']:,} | {s['recommended']:,} | {s['cap_change']:+,} | {s['rec_level']} |\n"
+        for s in summary_data
+    ])
+    emit(f"| **TOTAL** | **{total_cap:,}** | **{total_recommended:,}** | **{total_recommended - total_cap:+,}** | - |")
+    emit()
+    emit("---")
+    emit()
     
     # Key Insights
-    lines.append("## 6. Key Insights & Recommendations")
-    lines.append("")
-    
-    # Find highest/lowest utilization
-    highest_util = max(summary_data, key=lambda x: x["utilization"])
-    lowest_util = min(summary_data, key=lambda x: x["utilization"])
-    
-    lines.append("### High Performers")
-    lines.append("")
-    lines.append(f"1. **{highest_util['name']}** - Highest utilization at {highest_util['utilization']:.1f}%")
-    lines.append(f"   - Strong workforce demand")
-    lines.append(f"   - Headroom: {highest_util['headroom']:,}")
-    lines.append("")
-    
-    lines.append("### Areas for Attention")
-    lines.append("")
-    lines.append(f"1. **{lowest_util['name']}** - Lowest utilization at {lowest_util['utilization']:.1f}%")
-    lines.append(f"   - {lowest_util['headroom']:,} unused capacity")
-    lines.append(f"   - **Recommendation:** Review allocation methodology or demand patterns")
-    lines.append("")
+    emit("## 6. Key Insights & Recommendations")
+    emit()
+    
+    emit("### High Performers")
+    emit()
+    emit(f"1. **{highest_util['name']}** - Highest utilization at {highest_util['utilization']:.1f}%")
+    emit(f"   - Strong workforce demand")
+    emit(f"   - Headroom: {highest_util['headroom']:,}")
+    emit()
+    
+    emit("### Areas for Attention")
+    emit()
+    emit(f"1. **{lowest_util['name']}** - Lowest utilization at {lowest_util['utilization']:.1f}%")
+    emit(f"   - {lowest_util['headroom']:,} unused capacity")
+    emit(f"   - **Recommendation:** Review allocation methodology or demand patterns")
+    emit()
     
     # Diversification status
-    lines.append("### Diversification Status")
-    lines.append("")
-    lines.append("| Status | Countries |")
-    lines.append("|--------|-----------|")
-    
-    diversified = [s["name"] for s in summary_data if not any(p["tier"] == 1 for p in s["top_profs"])]
-    moderate = [s["name"] for s in summary_data if any(p["tier"] == 1 and p["share"] < 0.30 for p in s["top_profs"])]
-    alert = [s["name"] for s in summary_data if any(p["tier"] == 1 and p["share"] >= 0.30 for p in s["top_profs"])]
-    
-    lines.append(f"| **Fully Diversified** (No Tier 1) | {', '.join(diversified) if diversified else 'None'} |")
-    lines.append(f"| **Moderately Concentrated** (Tier 1 < 30%) | {', '.join(moderate) if moderate else 'None'} |")
-    lines.append(f"| **Concentration Alert** (Tier 1 >= 30%) | {', '.join(alert) if alert else 'None'} |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    emit("### Diversification Status")
+    emit()
+    emit("| Status | Countries |")
+    emit("|--------|-----------|")
+    
+    emit(f"| **Fully Diversified** (No Tier 1) | {', '.join(diversified) if diversified else 'None'} |")
+    emit(f"| **Moderately Concentrated** (Tier 1 < 30%) | {', '.join(moderate) if moderate else 'None'} |")
+    emit(f"| **Concentration Alert** (Tier 1 >= 30%) | {', '.join(concentrated) if concentrated else 'None'} |")
+    emit()
+    emit("---")
+    emit()
     
     # Appendix
-    lines.append("## Appendix A: Methodology")
-    lines.append("")
-    lines.append("### Tier Classification")
-    lines.append("")
-    lines.append("Professions are classified into tiers based on their share of total workforce, representing **demand patterns**:")
-    lines.append("")
-    lines.append("- **Tier 1 (Primary):** Share >= 15% - Highest demand jobs, get **priority allocation**")
-    lines.append("- **Tier 2 (Secondary):** Share >= 5% and < 15% - High demand, opens when Tier 1 demand satisfied")
-    lines.append("- **Tier 3 (Minor):** Share >= 1% and < 5% - Moderate demand")
-    lines.append("- **Tier 4 (Unusual):** Share < 1% - Low demand / specialized roles")
-    lines.append("")
-    lines.append("**Key Principle:** Since nationality quotas are limited, the system prioritizes Tier 1 professions first,")
-    lines.append("ensuring companies requesting high-demand jobs get served before lower tiers open.")
-    lines.append("")
-    lines.append("### Cap Recommendation Algorithm")
-    lines.append("")
-    lines.append("The AI recommendation engine considers:")
-    lines.append("- Current utilization rate")
-    lines.append("- Number of active dominance alerts")
-    lines.append("- Growth trend (6-month)")
-    lines.append("- Workforce diversification")
-    lines.append("")
-    lines.append("### Data Source")
-    lines.append("")
-    lines.append("- **File:** D:\\Quota\\real_data\\07_worker_stock.csv")
-    lines.append("- **Reference:** 01_nationalities.csv, 02_professions.csv, 05_nationality_caps.csv")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("*End of Report*")
-    
-    return "\n".join(lines)
+    out.write(METHODOLOGY_MD)
 
 
 if __name__ == "__main__":
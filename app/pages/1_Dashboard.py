@@ -79,7 +79,7 @@ def fetch_dashboard_data(nationality_code: str):
     Fetch dashboard data from quota engine.
     No fallbacks - production data only.
     """
-    from app.utils.real_data_loader import get_real_dashboard_data, check_real_data_available
+    from app.utils.real_data_loader import check_real_data_available, get_real_dashboard_data
     
     if not check_real_data_available():
         st.error("Real data files not found in real_data/ folder. Please ensure data is available.")
@@ -295,13 +295,14 @@ with col2:
 # ============================================================
 st.markdown("<hr style='margin: 2rem 0; border-color: #E0E0E0;'>", unsafe_allow_html=True)
 
-from app.utils.real_data_loader import is_qvc_country, is_non_qvc_country, get_qvc_capacity, get_outflow_capacity
+from app.utils.real_data_loader import is_qvc_country, is_non_qvc_country
+from app.utils.cached_data import get_qvc_capacity_cached, get_outflow_capacity_cached
 
 if is_qvc_country(selected_code):
     st.markdown("### 🏢 QVC Processing Capacity")
     render_gold_accent()
     
-    qvc_data = get_qvc_capacity(selected_code)
+    qvc_data = get_qvc_capacity_cached(selected_code)
     if qvc_data:
         qvc_cols = st.columns(4)
         
@@ -356,7 +357,7 @@ elif is_non_qvc_country(selected_code):
     st.markdown("### 📤 Monthly Allocation Capacity")
     render_gold_accent()
     
-    outflow_data = get_outflow_capacity(selected_code)
+    outflow_data = get_outflow_capacity_cached(selected_code)
     if outflow_data:
         st.markdown("""
         <div style="background: #FFF8E1; border-left: 4px solid #FFA000; padding: 0.75rem 1rem; margin-bottom: 1rem; border-radius: 4px;">
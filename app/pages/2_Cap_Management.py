@@ -72,7 +72,7 @@ selected_code = st.selectbox(
 
 def fetch_dashboard_data(nationality_code: str):
     """Fetch data using quota engine."""
-    from app.utils.real_data_loader import get_real_dashboard_data, check_real_data_available
+    from app.utils.real_data_loader import check_real_data_available, get_real_dashboard_data
     
     if not check_real_data_available():
         st.error("Real data files not found in real_data/ folder.")
@@ -81,6 +81,12 @@ def fetch_dashboard_data(nationality_code: str):
     return get_real_dashboard_data(nationality_code)
 
 
+# Admin: force a reload of cached capacity data
+with st.sidebar:
+    if st.button("🔄 Refresh Data", help="Clear cached capacity data and reload"):
+        from app.utils.cached_data import clear_cached_data
+        clear_cached_data()
+
 # Fetch data
 data = fetch_dashboard_data(selected_code)
 
@@ -11,7 +11,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import streamlit as st
+import orjson
 import requests
+import time
 from datetime import datetime
 
 from app.components.styles import (
@@ -40,6 +42,9 @@ render_header(
 
 API_BASE = st.session_state.get("api_base_url", "http://localhost:8000")
 
+# Minimum seconds between celebration animations on rapid approvals
+BALLOON_COOLDOWN_SECONDS = 30
+
 # Demo data
 # Restricted nationalities (matching database)
 NATIONALITIES = {
@@ -78,21 +83,38 @@ ESTABLISHMENTS = {
 }
 
 
+@st.cache_resource
+def _api_session() -> requests.Session:
+    """Shared HTTP session so API calls reuse pooled connections across reruns."""
+    session = requests.Session()
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return session
+
+
+def _post_json(url: str, body: dict) -> requests.Response:
+    """POST an orjson-encoded body through the shared API session."""
+    return _api_session().post(
+        url,
+        data=orjson.dumps(body),
+        headers={"Content-Type": "application/json"},
+        timeout=2,
+    )
+
+
 def check_eligibility(nationality_code: str, profession_id: int, establishment_id: int, count: int):
     """Check eligibility for request."""
     try:
-        response = requests.post(
+        response = _post_json(
             f"{API_BASE}/api/v1/requests/check-eligibility",
-            json={
+            {
                 "nationality_id": list(NATIONALITIES.keys()).index(nationality_code) + 1,
                 "profession_id": profession_id,
                 "establishment_id": establishment_id,
                 "requested_count": count,
             },
-            timeout=2
         )
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
     except Exception:
         pass
     
@@ -207,18 +229,17 @@ def _generate_eligibility_demo(nationality_code: str, profession_id: int, count:
 def submit_request(nationality_code: str, profession_id: int, establishment_id: int, count: int):
     """Submit a quota request."""
     try:
-        response = requests.post(
+        response = _post_json(
             f"{API_BASE}/api/v1/requests",
-            json={
+            {
                 "establishment_id": establishment_id,
                 "nationality_id": list(NATIONALITIES.keys()).index(nationality_code) + 1,
                 "profession_id": profession_id,
                 "requested_count": count,
             },
-            timeout=2
         )
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
     except Exception:
         pass
     
@@ -435,7 +456,12 @@ with submit_col2:
         
         if decision["decision"] == "APPROVED":
             st.success(f"✅ Request APPROVED! {decision['approved_count']} workers approved.")
-            st.balloons()
+            now = time.time()
+            if now - st.session_state.get("_last_balloon", 0) > BALLOON_COOLDOWN_SECONDS:
+                st.session_state._last_balloon = now
+                st.balloons()
+            else:
+                st.toast("Approved", icon="✅")
         elif decision["decision"] == "PARTIAL":
             st.warning(f"⚠️ PARTIAL approval: {decision['approved_count']} of {count} workers approved.")
         elif decision["decision"] == "QUEUED":
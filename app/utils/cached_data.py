@@ -0,0 +1,40 @@
+"""
+Cached data access for Streamlit pages.
+
+Thin wrappers around the real-data loader using st.cache_data, so
+widget reruns reuse results instead of recomputing them. Outflow
+capacity refreshes every minute; QVC center capacity, which comes from
+static reference data, every hour. Dashboard payloads are not wrapped
+here: get_real_dashboard_data already caches them per worker file mtime.
+
+Imports of the underlying modules are done lazily to avoid pulling in
+the quota engine on pages that never need it.
+"""
+
+from typing import Optional
+
+import streamlit as st
+
+
+OUTFLOW_TTL_SECONDS = 60
+REFERENCE_TTL_SECONDS = 3600
+
+
+@st.cache_data(ttl=REFERENCE_TTL_SECONDS, show_spinner=False)
+def get_qvc_capacity_cached(nationality_code: str) -> Optional[dict]:
+    """Cached get_qvc_capacity (None for non-QVC countries)."""
+    from app.utils.real_data_loader import get_qvc_capacity
+    return get_qvc_capacity(nationality_code)
+
+
+@st.cache_data(ttl=OUTFLOW_TTL_SECONDS, show_spinner=False)
+def get_outflow_capacity_cached(nationality_code: str) -> Optional[dict]:
+    """Cached get_outflow_capacity (None unless the country is outflow-based)."""
+    from app.utils.real_data_loader import get_outflow_capacity
+    return get_outflow_capacity(nationality_code)
+
+
+def clear_cached_data() -> None:
+    """Drop all cached payloads. Wire to an admin refresh button."""
+    get_qvc_capacity_cached.clear()
+    get_outflow_capacity_cached.clear()
@@ -5,20 +5,18 @@ When the FastAPI backend is not available, these functions
 query the database directly to provide real data.
 """
 
-import sys
-from pathlib import Path
+import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from src.models import (
     SessionLocal,
+    engine,
     Nationality,
     NationalityCap,
     NationalityTier,
@@ -27,9 +25,77 @@ from src.models import (
     RequestQueue,
     QuotaRequest,
 )
+from src.engines.quota_engine import TIER_ALLOCATION_PCT, TIER_NAMES
+from src.models.snapshots import get_dashboard_snapshot
 from src.models.worker import WorkerState
 from src.models.quota import TierLevel
-from src.models.request import QueueStatus
+from src.models.request import RequestStatus
+
+from src.utils.timestamps import last_updated_str
+
+
+logger = logging.getLogger(__name__)
+
+# Per-tier defaults: (tier_level, status, share_pct, headroom allocation)
+_TIER_DEFAULTS = tuple(
+    (level, status, share_pct, TIER_ALLOCATION_PCT[level - 1])
+    for level, status, share_pct in (
+        (1, "OPEN", 0.15),
+        (2, "OPEN", 0.08),
+        (3, "LIMITED", 0.03),
+        (4, "LIMITED", 0.01),
+    )
+)
+
+
+# Static demo payload; _get_demo_data() fills in the per-call fields.
+# Nested lists are shared between calls and must not be mutated.
+_DEMO_TEMPLATE = {
+    "nationality_id": 1,
+    "cap": 15000,
+    "stock": 12450,
+    "committed": 320,
+    "pending": 180,
+    "headroom": 1875,
+    "utilization_pct": 0.83,
+    "tier_statuses": [
+        {"tier_level": 1, "tier_name": "Primary", "status": "OPEN", "capacity": 800, "share_pct": 0.33},
+        {"tier_level": 2, "tier_name": "Secondary", "status": "RATIONED", "capacity": 320, "share_pct": 0.12},
+        {"tier_level": 3, "tier_name": "Minor", "status": "LIMITED", "capacity": 45, "share_pct": 0.03},
+        {"tier_level": 4, "tier_name": "Unusual", "status": "CLOSED", "capacity": 0, "share_pct": 0.01},
+    ],
+    "dominance_alerts": [
+        {
+            "profession_id": 1,
+            "profession_name": "Construction Supervisor",
+            "share_pct": 0.52,
+            "velocity": 0.08,
+            "alert_level": "CRITICAL",
+            "is_blocking": True,
+        },
+    ],
+    "queue_counts": {1: 45, 2: 89, 3: 12, 4: 3},
+    "projected_outflow": 187,
+}
+
+
+def _tier_defaults_subquery():
+    """
+    Build the four tier levels as a UNION ALL of literal rows.
+    
+    Used as the left side of an outer join so every tier level is
+    returned even when a nationality has no tier assignments.
+    (SQLite has no column-aliased VALUES, hence UNION ALL.)
+    """
+    return union_all(*[
+        select(
+            literal(level).label("tier_level"),
+            literal(status).label("status"),
+            literal(share_pct).label("share_pct"),
+            literal(allocation).label("allocation"),
+        )
+        for level, status, share_pct, allocation in _TIER_DEFAULTS
+    ]).subquery("tier_defaults")
 
 
 def get_db_session() -> Session:
@@ -37,6 +103,21 @@ def get_db_session() -> Session:
     return SessionLocal()
 
 
+@contextmanager
+def db_session() -> Iterator[Session]:
+    """Database session that always returns its connection to the pool."""
+    db = get_db_session()
+    try:
+        yield db
+    except OperationalError:
+        # Connection-level failure: drop pooled connections so the next
+        # rerun reconnects instead of reusing a dead one
+        engine.dispose()
+        raise
+    finally:
+        db.close()
+
+
 def get_dashboard_data(nationality_code: str) -> dict:
     """
     Get dashboard data directly from database.
@@ -47,217 +128,177 @@ def get_dashboard_data(nationality_code: str) -> dict:
     Returns:
         Dashboard data dictionary
     """
-    db = get_db_session()
     try:
-        # Get nationality
-        nationality = db.query(Nationality).filter(
-            Nationality.code == nationality_code
-        ).first()
-        
-        if not nationality:
-            return _get_demo_data(nationality_code)
-        
-        # Get current cap
-        current_year = datetime.now().year
-        cap = db.query(NationalityCap).filter(
-            NationalityCap.nationality_id == nationality.id,
-            NationalityCap.year == current_year
-        ).first()
-        
-        cap_limit = cap.cap_limit if cap else 15000
-        
-        # Get worker stock count
-        stock = db.query(func.count(WorkerStock.id)).filter(
-            WorkerStock.nationality_id == nationality.id,
-            WorkerStock.state == WorkerState.IN_COUNTRY
-        ).scalar() or 0
-        
-        # Get committed workers
-        committed = db.query(func.count(WorkerStock.id)).filter(
-            WorkerStock.nationality_id == nationality.id,
-            WorkerStock.state == WorkerState.COMMITTED
-        ).scalar() or 0
-        
-        # Get pending workers
-        pending = db.query(func.count(WorkerStock.id)).filter(
-            WorkerStock.nationality_id == nationality.id,
-            WorkerStock.state == WorkerState.PENDING
-        ).scalar() or 0
+        with db_session() as db:
+            # Pre-aggregated cap and worker counts (PostgreSQL only)
+            snapshot = get_dashboard_snapshot(db, nationality_code)
+            
+            # Get nationality with open alerts eagerly loaded
+            current_year = datetime.now().year
+            load_options = [
+                selectinload(Nationality.alerts.and_(DominanceAlert.resolved_date.is_(None))),
+                raiseload("*"),
+            ]
+            if snapshot is None:
+                load_options.insert(
+                    0, selectinload(Nationality.caps.and_(NationalityCap.year == current_year))
+                )
+            nationality = db.query(Nationality).options(*load_options).filter(
+                Nationality.code == nationality_code
+            ).one_or_none()
         
-        # Calculate headroom
-        effective_stock = stock + committed + int(pending * 0.8)
-        headroom = max(0, cap_limit - effective_stock)
-        utilization = effective_stock / cap_limit if cap_limit > 0 else 0
+            if not nationality:
+                return _get_demo_data(nationality_code)
         
-        # Get tier statuses
-        tiers = db.query(NationalityTier).filter(
-            NationalityTier.nationality_id == nationality.id
-        ).all()
+            if snapshot is not None:
+                cap_limit = snapshot["cap_limit"] or 15000
+                stock = snapshot["stock"] or 0
+                committed = snapshot["committed"] or 0
+                pending = snapshot["pending"] or 0
+            else:
+                cap = nationality.caps[0] if nationality.caps else None
+                cap_limit = cap.cap_limit if cap else 15000
+                
+                # Get worker counts per state in a single grouped query
+                state_counts = dict(
+                    db.query(WorkerStock.state, func.count(WorkerStock.id)).filter(
+                        WorkerStock.nationality_id == nationality.id
+                    ).group_by(WorkerStock.state).all()
+                )
+                stock = state_counts.get(WorkerState.IN_COUNTRY, 0)
+                committed = state_counts.get(WorkerState.COMMITTED, 0)
+                pending = state_counts.get(WorkerState.PENDING, 0)
         
-        tier_statuses = []
-        for tier in tiers:
-            tier_statuses.append({
-                "tier_level": tier.tier_level.value if hasattr(tier.tier_level, 'value') else tier.tier_level,
-                "tier_name": _get_tier_name(tier.tier_level),
-                "status": tier.status,
-                "capacity": tier.available_capacity or 0,
-                "share_pct": tier.share_percentage or 0,
-            })
+            # Calculate headroom
+            effective_stock = stock + committed + int(pending * 0.8)
+            headroom = max(0, cap_limit - effective_stock)
+            utilization = effective_stock / cap_limit if cap_limit > 0 else 0
         
-        # Fill missing tiers with defaults
-        existing_levels = {t["tier_level"] for t in tier_statuses}
-        for level in [1, 2, 3, 4]:
-            if level not in existing_levels:
-                tier_statuses.append({
+            # Get tier statuses: exactly four rows, ordered by tier level,
+            # with current tier shares summed and defaults for missing tiers
+            tiers = _tier_defaults_subquery()
+            tier_rows = db.query(
+                tiers.c.tier_level,
+                tiers.c.status,
+                tiers.c.allocation,
+                func.coalesce(func.sum(NationalityTier.share_pct), tiers.c.share_pct),
+            ).outerjoin(
+                NationalityTier,
+                and_(
+                    NationalityTier.tier_level == tiers.c.tier_level,
+                    NationalityTier.nationality_id == nationality.id,
+                    NationalityTier.valid_to.is_(None),
+                ),
+            ).group_by(
+                tiers.c.tier_level, tiers.c.status, tiers.c.allocation, tiers.c.share_pct
+            ).order_by(tiers.c.tier_level).all()
+            
+            tier_statuses = [
+                {
                     "tier_level": level,
-                    "tier_name": _get_tier_name(level),
-                    "status": "OPEN" if level <= 2 else "LIMITED",
-                    "capacity": int(headroom * (0.4 if level == 1 else 0.3 if level == 2 else 0.2 if level == 3 else 0.1)),
-                    "share_pct": 0.15 if level == 1 else 0.08 if level == 2 else 0.03 if level == 3 else 0.01,
-                })
-        
-        tier_statuses.sort(key=lambda x: x["tier_level"])
-        
-        # Get dominance alerts
-        alerts = db.query(DominanceAlert).filter(
-            DominanceAlert.nationality_id == nationality.id,
-            DominanceAlert.resolved_at.is_(None)
-        ).limit(5).all()
+                    "tier_name": TIER_NAMES[level - 1],
+                    "status": status,
+                    "capacity": int(headroom * allocation),
+                    "share_pct": share_pct,
+                }
+                for level, status, allocation, share_pct in tier_rows
+            ]
         
-        dominance_alerts = []
-        for alert in alerts:
-            dominance_alerts.append({
-                "profession_id": alert.profession_id,
-                "profession_name": f"Profession {alert.profession_id}",
-                "share_pct": alert.current_share or 0,
-                "velocity": alert.velocity or 0,
-                "alert_level": alert.alert_level.name if hasattr(alert.alert_level, 'name') else str(alert.alert_level),
-                "is_blocking": alert.is_blocking or False,
-            })
+            # Get dominance alerts
+            dominance_alerts = []
+            for alert in nationality.alerts[:5]:
+                dominance_alerts.append({
+                    "profession_id": alert.profession_id,
+                    "profession_name": f"Profession {alert.profession_id}",
+                    "share_pct": alert.share_pct or 0,
+                    "velocity": alert.velocity or 0,
+                    "alert_level": alert.alert_level.name if hasattr(alert.alert_level, 'name') else str(alert.alert_level),
+                    "is_blocking": alert.is_blocking or False,
+                })
         
-        # Get queue counts by tier
-        queue_counts = {}
-        for level in [1, 2, 3, 4]:
-            count = db.query(func.count(RequestQueue.id)).filter(
-                RequestQueue.nationality_id == nationality.id,
-                RequestQueue.status == QueueStatus.WAITING
-            ).scalar() or 0
-            queue_counts[level] = count // 4  # Distribute evenly for now
+            # Get queue counts by tier in a single grouped query
+            queued_by_tier = dict(
+                db.query(RequestQueue.tier_at_submission, func.count(RequestQueue.id)).join(
+                    QuotaRequest, RequestQueue.request_id == QuotaRequest.id
+                ).filter(
+                    QuotaRequest.nationality_id == nationality.id,
+                    QuotaRequest.status == RequestStatus.QUEUED,
+                ).group_by(RequestQueue.tier_at_submission).all()
+            )
+            queue_counts = {level: queued_by_tier.get(level, 0) for level in [1, 2, 3, 4]}
         
-        return {
-            "nationality_id": nationality.id,
-            "nationality_code": nationality_code,
-            "nationality_name": nationality.name,
-            "cap": cap_limit,
-            "stock": stock,
-            "committed": committed,
-            "pending": pending,
-            "headroom": headroom,
-            "utilization_pct": utilization,
-            "tier_statuses": tier_statuses,
-            "dominance_alerts": dominance_alerts,
-            "queue_counts": queue_counts,
-            "projected_outflow": int(stock * 0.015),  # ~1.5% monthly outflow estimate
-            "last_updated": datetime.now().isoformat(),
-        }
+            return {
+                "nationality_id": nationality.id,
+                "nationality_code": nationality_code,
+                "nationality_name": nationality.name,
+                "cap": cap_limit,
+                "stock": stock,
+                "committed": committed,
+                "pending": pending,
+                "headroom": headroom,
+                "utilization_pct": utilization,
+                "tier_statuses": tier_statuses,
+                "dominance_alerts": dominance_alerts,
+                "queue_counts": queue_counts,
+                "projected_outflow": int(stock * 0.015),  # ~1.5% monthly outflow estimate
+                "last_updated": last_updated_str(),
+            }
         
-    except Exception as e:
-        print(f"Database error: {e}")
+    except SQLAlchemyError:
+        logger.exception("Dashboard query failed for %s", nationality_code)
         return _get_demo_data(nationality_code)
-    finally:
-        db.close()
-
-
-def _get_tier_name(tier_level) -> str:
-    """Get human-readable tier name."""
-    if hasattr(tier_level, 'value'):
-        tier_level = tier_level.value
-    names = {1: "Primary", 2: "Secondary", 3: "Minor", 4: "Unusual"}
-    return names.get(tier_level, f"Tier {tier_level}")
 
 
 def _get_demo_data(nationality_code: str) -> dict:
     """Return demo data when database is unavailable."""
-    from app.pages import NATIONALITIES  # Import here to avoid circular
-    
-    return {
-        "nationality_id": 1,
-        "nationality_code": nationality_code,
-        "nationality_name": nationality_code,
-        "cap": 15000,
-        "stock": 12450,
-        "committed": 320,
-        "pending": 180,
-        "headroom": 1875,
-        "utilization_pct": 0.83,
-        "tier_statuses": [
-            {"tier_level": 1, "tier_name": "Primary", "status": "OPEN", "capacity": 800, "share_pct": 0.33},
-            {"tier_level": 2, "tier_name": "Secondary", "status": "RATIONED", "capacity": 320, "share_pct": 0.12},
-            {"tier_level": 3, "tier_name": "Minor", "status": "LIMITED", "capacity": 45, "share_pct": 0.03},
-            {"tier_level": 4, "tier_name": "Unusual", "status": "CLOSED", "capacity": 0, "share_pct": 0.01},
-        ],
-        "dominance_alerts": [
-            {
-                "profession_id": 1,
-                "profession_name": "Construction Supervisor",
-                "share_pct": 0.52,
-                "velocity": 0.08,
-                "alert_level": "CRITICAL",
-                "is_blocking": True,
-            },
-        ],
-        "queue_counts": {1: 45, 2: 89, 3: 12, 4: 3},
-        "projected_outflow": 187,
-        "last_updated": datetime.now().isoformat(),
-    }
+    data = _DEMO_TEMPLATE.copy()
+    data["nationality_code"] = nationality_code
+    data["nationality_name"] = nationality_code
+    data["last_updated"] = last_updated_str()
+    return data
 
 
 def get_all_nationalities() -> list[dict]:
     """Get all restricted nationalities from database."""
-    db = get_db_session()
     try:
-        nationalities = db.query(Nationality).filter(
-            Nationality.is_restricted == True
-        ).all()
+        with db_session() as db:
+            rows = db.query(Nationality.code, Nationality.name).filter(
+                Nationality.is_restricted.is_(True)
+            ).all()
         
-        return [
-            {"code": n.code, "name": n.name}
-            for n in nationalities
-        ]
-    except Exception:
+            return [{"code": code, "name": name} for code, name in rows]
+    except SQLAlchemyError:
+        logger.exception("Nationality list query failed")
         return []
-    finally:
-        db.close()
 
 
 def get_cap_data(nationality_code: str, year: int) -> dict:
     """Get cap management data."""
-    db = get_db_session()
     try:
-        nationality = db.query(Nationality).filter(
-            Nationality.code == nationality_code
-        ).first()
+        with db_session() as db:
+            nationality = db.query(Nationality).filter(
+                Nationality.code == nationality_code
+            ).first()
         
-        if not nationality:
-            return None
+            if not nationality:
+                return None
             
-        cap = db.query(NationalityCap).filter(
-            NationalityCap.nationality_id == nationality.id,
-            NationalityCap.year == year
-        ).first()
+            cap = db.query(NationalityCap).filter(
+                NationalityCap.nationality_id == nationality.id,
+                NationalityCap.year == year
+            ).first()
         
-        if cap:
-            return {
-                "nationality_id": nationality.id,
-                "nationality_code": nationality_code,
-                "year": year,
-                "cap_limit": cap.cap_limit,
-                "previous_cap": cap.previous_cap,
-                "set_by": cap.set_by,
-                "set_date": cap.created_at.isoformat() if cap.created_at else None,
-            }
-        return None
-    except Exception:
+            if cap:
+                return {
+                    "nationality_id": nationality.id,
+                    "nationality_code": nationality_code,
+                    "year": year,
+                    "cap_limit": cap.cap_limit,
+                    "previous_cap": cap.previous_cap,
+                    "set_by": cap.set_by,
+                    "set_date": cap.created_at.isoformat() if cap.created_at else None,
+                }
+            return None
+    except SQLAlchemyError:
+        logger.exception("Cap query failed for %s (%s)", nationality_code, year)
         return None
-    finally:
-        db.close()
@@ -7,28 +7,35 @@ All calculations are delegated to the quota_engine - NO fallbacks or demo data.
 This is a production-grade data loader.
 """
 
-import sys
-from pathlib import Path
-from datetime import datetime
+import threading
+from dataclasses import asdict
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 # Import the quota engine - single source of truth
+from src.engines import quota_engine
 from src.engines.quota_engine import (
     get_all_metrics,
+    get_all_metrics_from_precomputed,
+    calculate_recommended_cap,
     get_all_nationalities,
     is_qvc_country,
     is_outflow_based,
     get_qvc_capacity_details,
+    get_all_qvc_capacity_details,
+    get_tier_statuses,
+    TIER_NAMES,
+    TIER_ALLOCATION_PCT,
     QVC_COUNTRIES,
     OUTFLOW_BASED,
     STANDARD_NON_QVC,
     DATA_DIR,
+    clear_cache,
 )
 
+from src.utils.timestamps import last_updated_str
+
 
 # Nationality name mapping
 NATIONALITY_NAMES = {
@@ -46,13 +53,32 @@ NATIONALITY_NAMES = {
     'AFG': 'Afghanistan',
 }
 
+# Stable nationality IDs (hash() on str is salted per process)
+_NATIONALITY_ID = {code: i for i, code in enumerate(sorted(NATIONALITY_NAMES), start=1)}
+
+def _resolve_name(metrics: dict, nationality_code: str) -> str:
+    """Nationality name from engine metrics, falling back to the static map."""
+    return metrics.get('nationality_name') or NATIONALITY_NAMES.get(nationality_code, nationality_code)
+
 
 def check_real_data_available() -> bool:
     """
     Check if real data files are available.
     
-    Returns True if the essential data files exist.
+    Returns True if the essential data files exist. The result is
+    cached on the data directory's mtime, so adding or removing files
+    is picked up on the next call.
     """
+    try:
+        mtime_ns = DATA_DIR.stat().st_mtime_ns
+    except OSError:
+        return False
+    return _required_files_exist(mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _required_files_exist(mtime_ns: int) -> bool:
+    """Existence check for the essential data files; cached on DATA_DIR mtime."""
     required_files = [
         '07_worker_stock.csv',
         '01_nationalities.csv',
@@ -60,6 +86,11 @@ def check_real_data_available() -> bool:
     return all((DATA_DIR / f).exists() for f in required_files)
 
 
+_WORKER_STOCK_FILE = DATA_DIR / '07_worker_stock.csv'
+_data_mtime_ns = 0
+_data_mtime_lock = threading.Lock()
+
+
 def get_real_dashboard_data(nationality_code: str) -> Optional[dict]:
     """
     Get dashboard data for a nationality using the quota engine.
@@ -67,15 +98,38 @@ def get_real_dashboard_data(nationality_code: str) -> Optional[dict]:
     This is the main function called by the Streamlit dashboard.
     Returns a complete dictionary with all v4 metrics.
     
+    Results are cached per nationality until the worker stock file
+    changes; a new file mtime also clears the quota engine's caches,
+    once, under a lock shared by concurrent Streamlit sessions.
+    Each call returns a new top-level dict with a fresh last_updated;
+    the nested tier and alert lists are shared with the cache.
+    
     Args:
         nationality_code: ISO 3-letter code (e.g., 'IND')
         
     Returns:
         Dictionary with all dashboard metrics, or None if data unavailable
     """
+    global _data_mtime_ns
+    
     if not check_real_data_available():
         raise FileNotFoundError("Real data files not found in real_data/ folder")
     
+    mtime_ns = _WORKER_STOCK_FILE.stat().st_mtime_ns
+    if mtime_ns != _data_mtime_ns:
+        with _data_mtime_lock:
+            if mtime_ns != _data_mtime_ns:
+                if _data_mtime_ns:
+                    clear_cache()
+                    _compute_dashboard_cached.cache_clear()
+                _data_mtime_ns = mtime_ns
+    
+    return {**_compute_dashboard_cached(nationality_code, mtime_ns), 'last_updated': last_updated_str()}
+
+
+@lru_cache(maxsize=32)
+def _compute_dashboard_cached(nationality_code: str, mtime_ns: int) -> dict:
+    """Build the dashboard payload (minus last_updated); cached on (code, worker file mtime)."""
     # Get all metrics from quota engine
     metrics = get_all_metrics(nationality_code)
     
@@ -84,32 +138,19 @@ def get_real_dashboard_data(nationality_code: str) -> Optional[dict]:
     utilization = metrics['utilization_pct'] / 100  # Convert to decimal
     headroom = metrics['headroom']
     
+    statuses = get_tier_statuses(metrics['country_type'], utilization)
+    
     for tier_level in [1, 2, 3, 4]:
         tier_data = metrics['tier_summary'].get(str(tier_level), {})
         tier_share = tier_data.get('share', 0)
         
         # Calculate tier capacity based on headroom allocation
-        # Tier 1 gets 40%, Tier 2 gets 30%, Tier 3 gets 20%, Tier 4 gets 10%
-        allocation_pct = {1: 0.40, 2: 0.30, 3: 0.20, 4: 0.10}
-        tier_cap = int(headroom * allocation_pct[tier_level])
-        
-        # Determine status based on utilization and tier level
-        if metrics['country_type'] == 'OUTFLOW_BASED':
-            # Outflow-based countries have 100% utilization
-            status = "CLOSED"
-        elif utilization >= 0.95:
-            status = "CLOSED"
-        elif utilization >= 0.90:
-            status = "LIMITED" if tier_level <= 2 else "CLOSED"
-        elif utilization >= 0.80:
-            status = "RATIONED" if tier_level == 1 else "LIMITED" if tier_level == 2 else "CLOSED"
-        else:
-            status = "OPEN" if tier_level <= 2 else "RATIONED" if tier_level == 3 else "LIMITED"
+        tier_cap = int(headroom * TIER_ALLOCATION_PCT[tier_level - 1])
         
         tier_statuses.append({
             'tier_level': tier_level,
-            'tier_name': ['Primary', 'Secondary', 'Minor', 'Unusual'][tier_level - 1],
-            'status': status,
+            'tier_name': TIER_NAMES[tier_level - 1],
+            'status': statuses[tier_level - 1],
             'capacity': tier_cap,
             'share_pct': tier_share,
             'profession_count': tier_data.get('profession_count', 0),
@@ -143,9 +184,9 @@ def get_real_dashboard_data(nationality_code: str) -> Optional[dict]:
     
     return {
         # Identity
-        'nationality_id': hash(nationality_code) % 10000,
+        'nationality_id': _NATIONALITY_ID.get(nationality_code, 0),
         'nationality_code': nationality_code,
-        'nationality_name': metrics.get('nationality_name', NATIONALITY_NAMES.get(nationality_code, nationality_code)),
+        'nationality_name': _resolve_name(metrics, nationality_code),
         'country_type': metrics['country_type'],
         
         # Stock & Cap (v4)
@@ -199,7 +240,6 @@ def get_real_dashboard_data(nationality_code: str) -> Optional[dict]:
         'projected_outflow': projected_outflow,
         
         # Metadata
-        'last_updated': datetime.now().isoformat(),
         'data_source': 'quota_engine_v4',
         'formula_version': '4.0',
     }
@@ -223,6 +263,11 @@ def get_qvc_capacity(nationality_code: str) -> Optional[dict]:
     if not details:
         return None
     
+    return _build_qvc_capacity(nationality_code, details)
+
+
+def _build_qvc_capacity(nationality_code: str, details: dict) -> dict:
+    """Build the QVC capacity dict from quota engine details."""
     return {
         'nationality_code': nationality_code,
         'country': details['country'],
@@ -241,10 +286,11 @@ def get_all_qvc_capacity() -> dict:
     Returns:
         Dict with nationality_code as key, capacity data as value
     """
-    result = {}
-    for code in QVC_COUNTRIES:
-        result[code] = get_qvc_capacity(code)
-    return result
+    details = get_all_qvc_capacity_details()
+    return {
+        code: _build_qvc_capacity(code, details[code]) if code in details else None
+        for code in QVC_COUNTRIES
+    }
 
 
 def get_qvc_summary() -> dict:
@@ -254,20 +300,19 @@ def get_qvc_summary() -> dict:
     countries = []
     total_daily = 0
     
-    for code in QVC_COUNTRIES:
-        data = get_qvc_capacity(code)
-        if data:
-            countries.append({
-                'code': code,
-                'country': data['country'],
-                'daily_capacity': data['daily_capacity'],
-                'monthly_capacity': data['monthly_capacity'],
-                'center_count': data['center_count'],
-            })
-            total_daily += data['daily_capacity']
+    for code, details in get_all_qvc_capacity_details().items():
+        daily = details['daily_capacity']
+        total_daily += daily
+        countries.append({
+            'code': code,
+            'country': details['country'],
+            'daily_capacity': daily,
+            'monthly_capacity': details['monthly_capacity'],
+            'center_count': len(details['centers']),
+        })
     
     # Sort by daily capacity descending
-    countries.sort(key=lambda x: -x['daily_capacity'])
+    countries.sort(key=itemgetter('daily_capacity'), reverse=True)
     
     return {
         'total_daily_capacity': total_daily,
@@ -298,9 +343,29 @@ def get_outflow_capacity(nationality_code: str) -> Optional[dict]:
     if not is_outflow_based(nationality_code):
         return None
     
-    # Get metrics from quota engine
-    metrics = get_all_metrics(nationality_code)
+    return _build_outflow_capacity(nationality_code, _outflow_metrics(nationality_code))
+
+
+def _outflow_metrics(nationality_code: str) -> dict:
+    """
+    Get stock and flow metrics from the quota engine.
     
+    Honours the engine's USE_PRECOMPUTED switch the way get_all_metrics
+    does, so outflow figures match the dashboard. The live path uses
+    calculate_recommended_cap rather than get_all_metrics: outflow
+    capacity needs no tier classification or dominance alerts.
+    """
+    if quota_engine.USE_PRECOMPUTED:
+        try:
+            return get_all_metrics_from_precomputed(nationality_code)
+        except (ValueError, KeyError):
+            pass  # Fall through to full calculation
+    
+    return asdict(calculate_recommended_cap(nationality_code))
+
+
+def _build_outflow_capacity(nationality_code: str, metrics: dict) -> dict:
+    """Build the outflow capacity dict from quota engine metrics."""
     monthly_capacity = metrics.get('monthly_allocation', 0)
     if monthly_capacity is None:
         monthly_capacity = metrics['avg_annual_outflow'] // 12
@@ -309,7 +374,7 @@ def get_outflow_capacity(nationality_code: str) -> Optional[dict]:
     
     return {
         'nationality_code': nationality_code,
-        'country': metrics.get('nationality_name', NATIONALITY_NAMES.get(nationality_code, nationality_code)),
+        'country': _resolve_name(metrics, nationality_code),
         'capacity_type': 'outflow_based',
         'monthly_capacity': monthly_capacity,
         'annual_outflow': annual_outflow,
@@ -323,10 +388,7 @@ def get_all_non_qvc_capacity() -> dict:
     """
     Get outflow-based capacity for all non-QVC countries.
     """
-    result = {}
-    for code in OUTFLOW_BASED:
-        result[code] = get_outflow_capacity(code)
-    return result
+    return {code: _build_outflow_capacity(code, _outflow_metrics(code)) for code in OUTFLOW_BASED}
 
 
 def get_non_qvc_summary() -> dict:
@@ -337,8 +399,7 @@ def get_non_qvc_summary() -> dict:
     total_monthly = 0
     total_annual = 0
     
-    for code in OUTFLOW_BASED:
-        data = get_outflow_capacity(code)
+    for code, data in get_all_non_qvc_capacity().items():
         if data:
             countries.append({
                 'code': code,
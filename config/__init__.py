@@ -8,6 +8,14 @@ This module provides centralized configuration management including:
 - Azure OpenAI configuration
 """
 
-from config.settings import Settings, get_settings
+from config.settings import get_settings
 
 __all__ = ["Settings", "get_settings"]
+
+
+def __getattr__(name: str):
+    """Resolve `Settings` lazily so importing config doesn't load pydantic."""
+    if name == "Settings":
+        from config.settings import Settings
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
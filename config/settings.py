@@ -15,80 +15,105 @@ Usage:
 
 import os
 from functools import lru_cache
-from typing import Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+if TYPE_CHECKING:
+    from pydantic_settings import BaseSettings
 
 
-class Settings(BaseSettings):
+@lru_cache(maxsize=1)
+def _settings_class() -> type:
     """
-    Application settings loaded from environment variables.
-    
-    Attributes:
-        APP_NAME: Application display name.
-        APP_VERSION: Current application version.
-        DEBUG: Enable debug mode.
-        DATABASE_URL: SQLAlchemy database connection string.
-        AZURE_OPENAI_API_KEY: Azure OpenAI API key.
-        AZURE_OPENAI_ENDPOINT: Azure OpenAI endpoint URL.
-        AZURE_OPENAI_API_VERSION: Azure OpenAI API version.
-        AZURE_OPENAI_DEPLOYMENT: Azure OpenAI deployment/model name.
-    """
-    
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=True,
-        extra="ignore",
-    )
-    
-    # =========================================
-    # Application Settings
-    # =========================================
-    APP_NAME: str = "Qatar Nationality Quota System"
-    APP_VERSION: str = "2.0.0"
-    DEBUG: bool = False
+    Define the Settings model on first use.
     
-    # =========================================
-    # Database Settings
-    # =========================================
-    DATABASE_URL: str = Field(
-        default="sqlite:///./data/quota.db",
-        description="SQLAlchemy database connection string"
-    )
+    pydantic and pydantic-settings are imported here rather than at module
+    level, so importers that only need ParameterRegistry or the constants
+    below (engines, CLI scripts) don't pay for them.
     
-    # =========================================
-    # Azure OpenAI Settings
-    # =========================================
-    AZURE_OPENAI_API_KEY: Optional[str] = Field(
-        default=None,
-        description="Azure OpenAI API key"
-    )
-    AZURE_OPENAI_ENDPOINT: Optional[str] = Field(
-        default=None,
-        description="Azure OpenAI endpoint URL"
-    )
-    AZURE_OPENAI_API_VERSION: str = Field(
-        default="2024-02-15-preview",
-        description="Azure OpenAI API version"
-    )
-    AZURE_OPENAI_DEPLOYMENT: str = Field(
-        default="gpt-4o",
-        description="Azure OpenAI deployment/model name"
-    )
+    Returns:
+        type: The Settings class.
+    """
+    from pydantic import Field
+    from pydantic_settings import BaseSettings, SettingsConfigDict
     
-    # =========================================
-    # API Settings
-    # =========================================
-    API_HOST: str = "0.0.0.0"
-    API_PORT: int = 8000
-    API_PREFIX: str = "/api/v1"
+    class Settings(BaseSettings):
+        """
+        Application settings loaded from environment variables.
+        
+        Attributes:
+            APP_NAME: Application display name.
+            APP_VERSION: Current application version.
+            DEBUG: Enable debug mode.
+            DATABASE_URL: SQLAlchemy database connection string.
+            AZURE_OPENAI_API_KEY: Azure OpenAI API key.
+            AZURE_OPENAI_ENDPOINT: Azure OpenAI endpoint URL.
+            AZURE_OPENAI_API_VERSION: Azure OpenAI API version.
+            AZURE_OPENAI_DEPLOYMENT: Azure OpenAI deployment/model name.
+        """
+        
+        model_config = SettingsConfigDict(
+            env_file=".env",
+            env_file_encoding="utf-8",
+            case_sensitive=True,
+            extra="ignore",
+        )
+        
+        # =========================================
+        # Application Settings
+        # =========================================
+        APP_NAME: str = "Qatar Nationality Quota System"
+        APP_VERSION: str = "2.0.0"
+        DEBUG: bool = False
+        
+        # =========================================
+        # Database Settings
+        # =========================================
+        DATABASE_URL: str = Field(
+            default="sqlite:///./data/quota.db",
+            description="SQLAlchemy database connection string"
+        )
+        
+        # =========================================
+        # Azure OpenAI Settings
+        # =========================================
+        AZURE_OPENAI_API_KEY: Optional[str] = Field(
+            default=None,
+            description="Azure OpenAI API key"
+        )
+        AZURE_OPENAI_ENDPOINT: Optional[str] = Field(
+            default=None,
+            description="Azure OpenAI endpoint URL"
+        )
+        AZURE_OPENAI_API_VERSION: str = Field(
+            default="2024-02-15-preview",
+            description="Azure OpenAI API version"
+        )
+        AZURE_OPENAI_DEPLOYMENT: str = Field(
+            default="gpt-4o",
+            description="Azure OpenAI deployment/model name"
+        )
+        
+        # =========================================
+        # API Settings
+        # =========================================
+        API_HOST: str = "0.0.0.0"
+        API_PORT: int = 8000
+        API_PREFIX: str = "/api/v1"
+        
+        # =========================================
+        # Streamlit Settings
+        # =========================================
+        STREAMLIT_PORT: int = 8501
     
-    # =========================================
-    # Streamlit Settings
-    # =========================================
-    STREAMLIT_PORT: int = 8501
+    return Settings
+
+
+def __getattr__(name: str):
+    """Resolve `Settings` lazily (PEP 562) for `from config.settings import Settings`."""
+    if name == "Settings":
+        return _settings_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ParameterRegistry:
@@ -173,21 +198,29 @@ class ParameterRegistry:
         Returns:
             dict: All parameter names and their default values.
         """
-        return {
-            key: value for key, value in vars(cls).items()
-            if not key.startswith("_") and not callable(value)
-        }
+        return dict(_PARAMS)
 
 
-@lru_cache
-def get_settings() -> Settings:
+# Read-only parameter defaults, collected once from the class body
+# (classmethod objects are not callable, so they are excluded explicitly)
+_PARAMS = MappingProxyType({
+    key: value for key, value in vars(ParameterRegistry).items()
+    if not key.startswith("_") and not callable(value) and not isinstance(value, classmethod)
+})
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> "BaseSettings":
     """
     Get cached application settings instance.
     
+    Unbounded cache: there is only ever one entry, and maxsize=None skips
+    the LRU bookkeeping and its lock on every call.
+    
     Returns:
         Settings: Application settings loaded from environment.
     """
-    return Settings()
+    return _settings_class()()
 
 
 def get_parameter(name: str, default: any = None) -> any:
@@ -201,7 +234,7 @@ def get_parameter(name: str, default: any = None) -> any:
     Returns:
         Parameter value or default.
     """
-    return getattr(ParameterRegistry, name, default)
+    return _PARAMS.get(name, default)
 
 
 # Strategic sectors that receive priority scoring bonus
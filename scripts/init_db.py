@@ -31,6 +31,7 @@ from src.models import (
     ParameterRegistry,
     DEFAULT_PARAMETERS,
 )
+from src.models.snapshots import create_dashboard_snapshots, drop_dashboard_snapshots
 
 
 def create_tables() -> None:
@@ -40,9 +41,18 @@ def create_tables() -> None:
     print("[OK] Tables created successfully")
 
 
+def create_snapshot_views() -> None:
+    """Create dashboard snapshot materialized view (PostgreSQL only)."""
+    if create_dashboard_snapshots(engine):
+        print("[OK] Dashboard snapshot view created")
+    else:
+        print("  - Dashboard snapshot view skipped (requires PostgreSQL)")
+
+
 def drop_tables() -> None:
     """Drop all database tables."""
     print("Dropping all tables...")
+    drop_dashboard_snapshots(engine)
     Base.metadata.drop_all(bind=engine)
     print("[OK] Tables dropped")
 
@@ -164,6 +174,7 @@ def main():
         print()
     
     create_tables()
+    create_snapshot_views()
     print()
     
     # Initialize data
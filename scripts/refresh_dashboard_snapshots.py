@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Dashboard snapshot refresh job.
+
+Refreshes the dashboard_snapshots materialized view so dashboards
+serve pre-aggregated cap and worker counts. Requires PostgreSQL; on
+other databases the job exits without doing anything.
+
+Usage:
+    python scripts/refresh_dashboard_snapshots.py               # Refresh once
+    python scripts/refresh_dashboard_snapshots.py --interval 300  # Refresh every 5 minutes
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import engine
+from src.models.snapshots import create_dashboard_snapshots, refresh_dashboard_snapshots
+
+
+def refresh_once() -> bool:
+    """Create the view if needed and refresh it."""
+    if not create_dashboard_snapshots(engine):
+        print("Dashboard snapshots require PostgreSQL - nothing to refresh.")
+        return False
+    
+    refresh_dashboard_snapshots(engine, concurrently=True)
+    print(f"[OK] {datetime.now().isoformat(timespec='seconds')} dashboard_snapshots refreshed")
+    return True
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Refresh dashboard snapshot view")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Seconds between refreshes (0 = refresh once and exit)"
+    )
+    args = parser.parse_args()
+    
+    if not refresh_once() or args.interval <= 0:
+        return
+    
+    while True:
+        time.sleep(args.interval)
+        refresh_once()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from config.settings import get_settings
 from src.models.base import init_database
@@ -71,6 +72,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses (eligibility messages, alternatives, lists)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 
 # Import and include routers
 from src.api.routes import dashboard, caps, requests, queue, alerts
@@ -133,7 +133,13 @@ async def get_nationality_dashboard(nationality_code: str):
     - QVC constraint status (for QVC countries)
     - Tier statuses and dominance alerts
     """
-    from src.engines.quota_engine import get_all_metrics, get_all_nationalities
+    from src.engines.quota_engine import (
+        TIER_ALLOCATION_PCT,
+        TIER_NAMES,
+        get_all_metrics,
+        get_all_nationalities,
+        get_tier_statuses,
+    )
     
     # Validate nationality code
     valid_codes = get_all_nationalities()
@@ -148,53 +154,31 @@ async def get_nationality_dashboard(nationality_code: str):
     # Get metrics from quota engine
     try:
         metrics = get_all_metrics(code)
-    except Exception as e:
+    except (OSError, ValueError, KeyError) as e:
+        # Missing/unreadable data files, malformed JSON or CSV values
         raise HTTPException(
             status_code=500,
             detail=f"Error calculating metrics: {str(e)}"
         )
     
     # Build tier statuses
-    tier_names = {1: "Primary", 2: "Secondary", 3: "Minor", 4: "Unusual"}
     tier_statuses = []
     
     headroom = metrics['headroom']
     utilization = metrics['utilization_pct'] / 100
+    statuses = get_tier_statuses(metrics['country_type'], utilization)
     
     for tier_level in [1, 2, 3, 4]:
         tier_data = metrics['tier_summary'].get(str(tier_level), {})
         tier_share = tier_data.get('share', 0)
         
         # Calculate tier capacity based on headroom allocation
-        allocation_pct = {1: 0.40, 2: 0.30, 3: 0.20, 4: 0.10}
-        tier_cap = int(headroom * allocation_pct[tier_level])
-        
-        # Determine status
-        if metrics['country_type'] == 'OUTFLOW_BASED':
-            status = TierStatusEnum.CLOSED
-        elif utilization >= 0.95:
-            status = TierStatusEnum.CLOSED
-        elif utilization >= 0.90:
-            status = TierStatusEnum.LIMITED if tier_level <= 2 else TierStatusEnum.CLOSED
-        elif utilization >= 0.80:
-            if tier_level == 1:
-                status = TierStatusEnum.RATIONED
-            elif tier_level == 2:
-                status = TierStatusEnum.LIMITED
-            else:
-                status = TierStatusEnum.CLOSED
-        else:
-            if tier_level <= 2:
-                status = TierStatusEnum.OPEN
-            elif tier_level == 3:
-                status = TierStatusEnum.RATIONED
-            else:
-                status = TierStatusEnum.LIMITED
+        tier_cap = int(headroom * TIER_ALLOCATION_PCT[tier_level - 1])
         
         tier_statuses.append(TierStatusV4(
             tier_level=tier_level,
-            tier_name=tier_names[tier_level],
-            status=status,
+            tier_name=TIER_NAMES[tier_level - 1],
+            status=TierStatusEnum(statuses[tier_level - 1]),
             capacity=tier_cap,
             share_pct=tier_share,
             profession_count=tier_data.get('profession_count', 0),
@@ -288,8 +272,8 @@ async def get_dashboard_overview():
             total_workers += response.current_stock
             total_cap += response.recommended_cap
             total_headroom += response.headroom
-        except Exception:
-            # Skip nationalities with errors
+        except (HTTPException, ValueError):
+            # Skip nationalities with errors (pydantic validation errors are ValueErrors)
             continue
     
     return DashboardOverviewV4(
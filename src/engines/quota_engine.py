@@ -14,13 +14,22 @@ Key Principles:
 """
 
 import csv
-import json
+from collections import Counter
+from operator import itemgetter
 from dataclasses import dataclass
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterator, Optional
 from functools import lru_cache
 
+try:
+    import orjson as _json
+except ImportError:  # stdlib fallback
+    import json as _json
+
+from src.utils.timestamps import last_updated_str
+
 
 # =============================================================================
 # CONSTANTS (from v4 methodology)
@@ -31,15 +40,20 @@ QVC_COUNTRIES = ['BGD', 'IND', 'NPL', 'PAK', 'PHL', 'LKA']
 OUTFLOW_BASED = ['EGY', 'YEM', 'SYR', 'IRN', 'IRQ']
 STANDARD_NON_QVC = ['AFG']
 
+# Membership sets (the lists above keep display/iteration order)
+_QVC_SET = frozenset(QVC_COUNTRIES)
+_OUTFLOW_SET = frozenset(OUTFLOW_BASED)
+_STANDARD_SET = frozenset(STANDARD_NON_QVC)
+
 # QVC Annual Capacity (daily × 264 working days)
-QVC_ANNUAL_CAPACITY = {
+QVC_ANNUAL_CAPACITY = MappingProxyType({
     'LKA': 39600,   # 150 × 264
     'BGD': 135960,  # 515 × 264
     'PAK': 97680,   # 370 × 264
     'IND': 212520,  # 805 × 264
     'NPL': 85800,   # 325 × 264
     'PHL': 73920    # 280 × 264
-}
+})
 
 # Buffer Percentages
 BUFFER_POSITIVE_QVC = 0.10      # 10% for positive growth QVC
@@ -61,13 +75,30 @@ DOMINANCE_CRITICAL = 0.50
 DOMINANCE_HIGH = 0.40
 DOMINANCE_WATCH = 0.30
 
-# Nationality Code Mapping
-NATIONALITY_CODES = {
+# Tier status by cap utilization bucket (>= 95%, >= 90%, >= 80%, below),
+# indexed by tier_level - 1. Outflow-based countries always use row 0.
+TIER_STATUS_TABLE = (
+    ('CLOSED', 'CLOSED', 'CLOSED', 'CLOSED'),
+    ('LIMITED', 'LIMITED', 'CLOSED', 'CLOSED'),
+    ('RATIONED', 'LIMITED', 'CLOSED', 'CLOSED'),
+    ('OPEN', 'OPEN', 'RATIONED', 'LIMITED'),
+)
+
+# Tier display names and share of headroom allocated to each tier,
+# indexed by tier_level - 1 like TIER_STATUS_TABLE
+TIER_NAMES = ('Primary', 'Secondary', 'Minor', 'Unusual')
+TIER_ALLOCATION_PCT = (0.40, 0.30, 0.20, 0.10)
+
+# Nationality Code Mapping (read-only)
+NATIONALITY_CODES = MappingProxyType({
     'EGY': '818', 'IND': '356', 'PAK': '586', 'NPL': '524',
     'BGD': '050', 'PHL': '608', 'IRN': '364', 'IRQ': '368',
     'YEM': '886', 'SYR': '760', 'AFG': '004', 'LKA': '144',
-}
-NUMERIC_TO_ISO = {v: k for k, v in NATIONALITY_CODES.items()}
+})
+NUMERIC_TO_ISO = MappingProxyType({v: k for k, v in NATIONALITY_CODES.items()})
+_ISO_BY_CLEAN_NUMERIC = MappingProxyType({
+    v.lstrip('0') or '0': k for k, v in NATIONALITY_CODES.items()
+})
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent.parent / 'real_data'
@@ -136,6 +167,15 @@ class TierClassification:
     tier_level: int  # 1, 2, 3, or 4
 
 
+@dataclass(slots=True)
+class WorkerRecord:
+    """Long-term worker row with fields normalized and parsed once at load."""
+    profession_code: str
+    in_country: bool
+    employment_start: Optional[date]
+    employment_end: Optional[date]
+
+
 @dataclass
 class DominanceAlert:
     """Dominance alert for a nationality-profession pair."""
@@ -152,19 +192,71 @@ class DominanceAlert:
 # DATA LOADING
 # =============================================================================
 
-@lru_cache(maxsize=1)
-def _load_workers() -> list[dict]:
-    """Load worker stock data from CSV. Cached for performance."""
+# Worker stock columns used by the engine, in _iter_workers() tuple order
+WORKER_FIELDS = ('nationality_code', 'state', 'profession_code', 'employment_start', 'employment_end')
+
+
+def _iter_workers() -> Iterator[tuple[str, ...]]:
+    """
+    Stream worker stock rows from CSV as WORKER_FIELDS tuples.
+    
+    Column positions are resolved from the header once; missing columns
+    read as ''. Rows are not kept: _workers_by_nationality() consumes
+    them once and caches only the compact WorkerRecord index.
+    """
     filepath = DATA_DIR / '07_worker_stock.csv'
     if not filepath.exists():
         raise FileNotFoundError(f"Worker stock file not found: {filepath}")
     
-    workers = []
-    with open(filepath, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            workers.append(row)
-    return workers
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        
+        # A missing column points one past the header, at a padded ''
+        positions = [header.index(name) if name in header else len(header) for name in WORKER_FIELDS]
+        if len(header) in positions:
+            reader = (row + [''] for row in reader)
+        
+        yield from map(itemgetter(*positions), reader)
+
+
+@lru_cache(maxsize=1)
+def _workers_by_nationality() -> dict[str, list[WorkerRecord]]:
+    """
+    Index long-term workers by nationality code (leading zeros stripped).
+    
+    Built in one pass over the worker file: every calculation only counts
+    long-term workers, so the duration filter, state check, profession
+    normalization and date parsing are done here once instead of in
+    every calculation loop. Long-term status is evaluated against the
+    date the index is built; clear_cache() rebuilds it.
+    """
+    today = date.today()
+    index: dict[str, list[WorkerRecord]] = {}
+    
+    for nat_code, state, prof_code, start, end in _iter_workers():
+        emp_start = _parse_date(start)
+        emp_end = _parse_date(end)
+        
+        # Only long-term workers (include if no start date)
+        if emp_start and ((emp_end or today) - emp_start).days < MIN_EMPLOYMENT_DAYS:
+            continue
+        
+        w_nat = nat_code.strip().strip('"').lstrip('0')
+        index.setdefault(w_nat, []).append(WorkerRecord(
+            profession_code=prof_code.strip().strip('"'),
+            in_country=state.strip().upper() in ('IN_COUNTRY', 'ACTIVE', ''),
+            employment_start=emp_start,
+            employment_end=emp_end,
+        ))
+    
+    return index
+
+
+def _get_workers(iso_code: str) -> list[WorkerRecord]:
+    """Get long-term worker records for a single nationality."""
+    numeric_code = _get_numeric_code(iso_code)
+    return _workers_by_nationality().get(numeric_code.lstrip('0'), [])
 
 
 @lru_cache(maxsize=1)
@@ -210,8 +302,7 @@ def _load_qvc_capacity() -> dict:
     if not filepath.exists():
         return {}
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _json.loads(filepath.read_bytes())
 
 
 @lru_cache(maxsize=1)
@@ -221,8 +312,7 @@ def _load_precomputed_summary() -> dict:
     if not filepath.exists():
         return {}
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _json.loads(filepath.read_bytes())
     return data.get('nationalities', {})
 
 
@@ -233,13 +323,13 @@ def _load_growth_by_year() -> dict:
     if not filepath.exists():
         return {}
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _json.loads(filepath.read_bytes())
 
 
 def clear_cache():
     """Clear all cached data. Call when data files change."""
-    _load_workers.cache_clear()
+    _workers_by_nationality.cache_clear()
+    _total_by_profession.cache_clear()
     _load_nationalities.cache_clear()
     _load_professions.cache_clear()
     _load_qvc_capacity.cache_clear()
@@ -259,11 +349,7 @@ def _get_numeric_code(iso_code: str) -> str:
 def _get_iso_code(numeric_code: str) -> str:
     """Convert numeric code to ISO 3-letter code."""
     # Handle leading zeros
-    clean_code = numeric_code.lstrip('0') or '0'
-    for num, iso in NUMERIC_TO_ISO.items():
-        if num.lstrip('0') == clean_code:
-            return iso
-    return numeric_code
+    return _ISO_BY_CLEAN_NUMERIC.get(numeric_code.lstrip('0') or '0', numeric_code)
 
 
 def _parse_date(date_str: str) -> Optional[date]:
@@ -278,31 +364,13 @@ def _parse_date(date_str: str) -> Optional[date]:
         return None
 
 
-def _is_long_term(worker: dict, reference_date: date = None) -> bool:
-    """Check if worker has employment duration >= 365 days."""
-    if reference_date is None:
-        reference_date = date.today()
-    
-    emp_start = _parse_date(worker.get('employment_start', ''))
-    emp_end = _parse_date(worker.get('employment_end', ''))
-    
-    if not emp_start:
-        return True  # Include if no start date
-    
-    # Use employment_end if present, otherwise today
-    end_date = emp_end if emp_end else reference_date
-    duration = (end_date - emp_start).days
-    
-    return duration >= MIN_EMPLOYMENT_DAYS
-
-
 def _get_country_type(iso_code: str) -> str:
     """Determine country type for a nationality."""
-    if iso_code in QVC_COUNTRIES:
+    if iso_code in _QVC_SET:
         return 'QVC'
-    elif iso_code in OUTFLOW_BASED:
+    elif iso_code in _OUTFLOW_SET:
         return 'OUTFLOW_BASED'
-    elif iso_code in STANDARD_NON_QVC:
+    elif iso_code in _STANDARD_SET:
         return 'STANDARD_NON_QVC'
     else:
         return 'UNKNOWN'
@@ -321,29 +389,7 @@ def calculate_stock(iso_code: str) -> int:
         - status = 'IN_COUNTRY'
         - employment_duration >= 365 days
     """
-    workers = _load_workers()
-    numeric_code = _get_numeric_code(iso_code)
-    
-    count = 0
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        state = w.get('state', '').strip().upper()
-        
-        # Match nationality (handle leading zeros)
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only IN_COUNTRY workers
-        if state not in ('IN_COUNTRY', 'ACTIVE', ''):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        count += 1
-    
-    return count
+    return sum(1 for w in _get_workers(iso_code) if w.in_country)
 
 
 def calculate_joiners(iso_code: str, year: int) -> int:
@@ -352,27 +398,10 @@ def calculate_joiners(iso_code: str, year: int) -> int:
     
     Joiners = COUNT workers WHERE employment_start is in year
     """
-    workers = _load_workers()
-    numeric_code = _get_numeric_code(iso_code)
-    
-    count = 0
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        
-        # Match nationality
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        # Check employment_start year
-        emp_start = _parse_date(w.get('employment_start', ''))
-        if emp_start and emp_start.year == year:
-            count += 1
-    
-    return count
+    return sum(
+        1 for w in _get_workers(iso_code)
+        if w.employment_start and w.employment_start.year == year
+    )
 
 
 def calculate_outflow(iso_code: str, year: int) -> int:
@@ -381,27 +410,10 @@ def calculate_outflow(iso_code: str, year: int) -> int:
     
     Outflow = COUNT workers WHERE employment_end is in year
     """
-    workers = _load_workers()
-    numeric_code = _get_numeric_code(iso_code)
-    
-    count = 0
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        
-        # Match nationality
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        # Check employment_end year
-        emp_end = _parse_date(w.get('employment_end', ''))
-        if emp_end and emp_end.year == year:
-            count += 1
-    
-    return count
+    return sum(
+        1 for w in _get_workers(iso_code)
+        if w.employment_end and w.employment_end.year == year
+    )
 
 
 def calculate_growth_rate(iso_code: str) -> tuple[float, int, int]:
@@ -412,26 +424,13 @@ def calculate_growth_rate(iso_code: str) -> tuple[float, int, int]:
     
     Formula: Growth = (Total_2025 - Total_2024) / Total_2024 × 100
     """
-    workers = _load_workers()
-    numeric_code = _get_numeric_code(iso_code)
-    
     # Count workers active in each year
     total_2024 = 0
     total_2025 = 0
     
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        
-        # Match nationality
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        emp_start = _parse_date(w.get('employment_start', ''))
-        emp_end = _parse_date(w.get('employment_end', ''))
+    for w in _get_workers(iso_code):
+        emp_start = w.employment_start
+        emp_end = w.employment_end
         
         if not emp_start:
             continue
@@ -600,33 +599,13 @@ def calculate_tier_classification(iso_code: str) -> list[TierClassification]:
     
     Tier Share = Workers_in_Profession / Total_Workers_of_Nationality × 100
     """
-    workers = _load_workers()
     professions = _load_professions()
-    numeric_code = _get_numeric_code(iso_code)
-    
-    # Count workers by profession
-    profession_counts: dict[str, int] = {}
-    total_workers = 0
     
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        state = w.get('state', '').strip().upper()
-        
-        # Match nationality
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only IN_COUNTRY workers
-        if state not in ('IN_COUNTRY', 'ACTIVE', ''):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        prof_code = w.get('profession_code', '').strip().strip('"')
-        profession_counts[prof_code] = profession_counts.get(prof_code, 0) + 1
-        total_workers += 1
+    # Count IN_COUNTRY workers by profession
+    profession_counts = Counter(
+        w.profession_code for w in _get_workers(iso_code) if w.in_country
+    )
+    total_workers = profession_counts.total()
     
     # Classify into tiers
     classifications = []
@@ -653,6 +632,17 @@ def calculate_tier_classification(iso_code: str) -> list[TierClassification]:
     return classifications
 
 
+@lru_cache(maxsize=1)
+def _total_by_profession() -> Counter:
+    """Count long-term IN_COUNTRY workers per profession across all nationalities."""
+    total_by_profession = Counter()
+    
+    for workers in _workers_by_nationality().values():
+        total_by_profession.update(w.profession_code for w in workers if w.in_country)
+    
+    return total_by_profession
+
+
 def calculate_dominance_alerts(iso_code: str) -> list[DominanceAlert]:
     """
     Calculate dominance alerts for a nationality.
@@ -660,48 +650,15 @@ def calculate_dominance_alerts(iso_code: str) -> list[DominanceAlert]:
     Dominance Share = Nationality_Workers_in_Profession / Total_Workers_in_Profession × 100
     Only applies to professions with >= 200 total workers.
     """
-    workers = _load_workers()
     professions = _load_professions()
-    numeric_code = _get_numeric_code(iso_code)
     
-    # First pass: count total workers per profession (all nationalities)
-    total_by_profession: dict[str, int] = {}
-    
-    for w in workers:
-        state = w.get('state', '').strip().upper()
-        
-        # Only IN_COUNTRY workers
-        if state not in ('IN_COUNTRY', 'ACTIVE', ''):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        prof_code = w.get('profession_code', '').strip().strip('"')
-        total_by_profession[prof_code] = total_by_profession.get(prof_code, 0) + 1
+    # Total workers per profession (all nationalities), shared across calls
+    total_by_profession = _total_by_profession()
     
-    # Second pass: count this nationality's workers per profession
-    nat_by_profession: dict[str, int] = {}
-    
-    for w in workers:
-        w_nat = w.get('nationality_code', '').strip().strip('"')
-        state = w.get('state', '').strip().upper()
-        
-        # Match nationality
-        if w_nat.lstrip('0') != numeric_code.lstrip('0'):
-            continue
-        
-        # Only IN_COUNTRY workers
-        if state not in ('IN_COUNTRY', 'ACTIVE', ''):
-            continue
-        
-        # Only long-term workers
-        if not _is_long_term(w):
-            continue
-        
-        prof_code = w.get('profession_code', '').strip().strip('"')
-        nat_by_profession[prof_code] = nat_by_profession.get(prof_code, 0) + 1
+    # Count this nationality's IN_COUNTRY workers per profession
+    nat_by_profession = Counter(
+        w.profession_code for w in _get_workers(iso_code) if w.in_country
+    )
     
     # Calculate dominance and generate alerts
     alerts = []
@@ -916,7 +873,7 @@ def get_all_metrics_from_precomputed(iso_code: str) -> dict:
         'dominance_alerts': alert_list,
         'alert_count': len(alert_list),
         'has_critical': any(a.get('alert_level') == 'CRITICAL' for a in alert_list),
-        'last_updated': datetime.now().isoformat(),
+        'last_updated': last_updated_str(),
         'formula_version': '4.0',
     }
 
@@ -1036,7 +993,7 @@ def get_all_metrics(iso_code: str) -> dict:
         'has_critical': any(a['alert_level'] == 'CRITICAL' for a in alert_list),
         
         # Metadata
-        'last_updated': datetime.now().isoformat(),
+        'last_updated': last_updated_str(),
         'formula_version': '4.0',
     }
 
@@ -1052,17 +1009,37 @@ def get_all_nationalities() -> list[str]:
 
 def is_qvc_country(iso_code: str) -> bool:
     """Check if nationality is a QVC country."""
-    return iso_code in QVC_COUNTRIES
+    return iso_code in _QVC_SET
 
 
 def is_outflow_based(iso_code: str) -> bool:
     """Check if nationality uses outflow-based allocation."""
-    return iso_code in OUTFLOW_BASED
+    return iso_code in _OUTFLOW_SET
+
+
+def get_tier_statuses(country_type: str, utilization: float) -> tuple[str, str, str, str]:
+    """
+    Get the status of each tier for a nationality.
+    
+    Args:
+        country_type: 'QVC', 'OUTFLOW_BASED', 'STANDARD_NON_QVC'
+        utilization: Cap utilization as a decimal (0.85 = 85%)
+        
+    Returns:
+        Statuses for tiers 1-4, indexed by tier_level - 1
+    """
+    if country_type == 'OUTFLOW_BASED' or utilization >= 0.95:
+        return TIER_STATUS_TABLE[0]
+    if utilization >= 0.90:
+        return TIER_STATUS_TABLE[1]
+    if utilization >= 0.80:
+        return TIER_STATUS_TABLE[2]
+    return TIER_STATUS_TABLE[3]
 
 
 def get_qvc_capacity_details(iso_code: str) -> Optional[dict]:
     """Get QVC capacity details for a nationality."""
-    if iso_code not in QVC_COUNTRIES:
+    if iso_code not in _QVC_SET:
         return None
     
     qvc_data = _load_qvc_capacity()
@@ -1071,7 +1048,21 @@ def get_qvc_capacity_details(iso_code: str) -> Optional[dict]:
     if iso_code not in centers:
         return None
     
-    center_data = centers[iso_code]
+    return _qvc_details(iso_code, centers[iso_code])
+
+
+def get_all_qvc_capacity_details() -> dict[str, dict]:
+    """Get QVC capacity details for every QVC country with center data."""
+    centers = _load_qvc_capacity().get('centers', {})
+    return {
+        iso_code: _qvc_details(iso_code, center_data)
+        for iso_code, center_data in centers.items()
+        if iso_code in _QVC_SET
+    }
+
+
+def _qvc_details(iso_code: str, center_data: dict) -> dict:
+    """Build QVC capacity details from a country's center data."""
     daily = center_data.get('total_daily_capacity', 0)
     
     return {
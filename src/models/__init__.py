@@ -55,6 +55,13 @@ from src.models.config import (
     DEFAULT_PARAMETERS,
 )
 
+# Dashboard snapshots (PostgreSQL materialized view)
+from src.models.snapshots import (
+    create_dashboard_snapshots,
+    refresh_dashboard_snapshots,
+    get_dashboard_snapshot,
+)
+
 __all__ = [
     # Base
     "Base",
@@ -87,4 +94,8 @@ __all__ = [
     # Configuration
     "ParameterRegistry",
     "DEFAULT_PARAMETERS",
+    # Dashboard snapshots
+    "create_dashboard_snapshots",
+    "refresh_dashboard_snapshots",
+    "get_dashboard_snapshot",
 ]
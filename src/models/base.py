@@ -35,8 +35,15 @@ if DATABASE_URL.startswith("sqlite"):
         echo=False,
     )
 else:
-    # PostgreSQL or other databases
-    engine = create_engine(DATABASE_URL, echo=False)
+    # PostgreSQL or other databases - pooled connections, validated on checkout
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        echo=False,
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,148 @@
+"""
+Dashboard snapshot materialized view.
+
+This module manages the dashboard_snapshots materialized view, which
+pre-aggregates the per-nationality dashboard payload (current cap and
+worker counts by state) so dashboards read one indexed row instead of
+aggregating worker_stock on every request.
+
+Materialized views are PostgreSQL-only. On other backends (the default
+SQLite database) every function here is a no-op and callers fall back
+to live aggregation.
+
+Usage:
+    from src.models.snapshots import refresh_dashboard_snapshots
+    refresh_dashboard_snapshots(engine)
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+SNAPSHOT_VIEW = "dashboard_snapshots"
+
+CREATE_SNAPSHOT_VIEW_SQL = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {SNAPSHOT_VIEW} AS
+SELECT
+    n.id AS nationality_id,
+    n.code AS code,
+    n.name AS name,
+    c.cap_limit AS cap_limit,
+    COUNT(ws.id) FILTER (WHERE ws.state = 'IN_COUNTRY') AS stock,
+    COUNT(ws.id) FILTER (WHERE ws.state = 'COMMITTED') AS committed,
+    COUNT(ws.id) FILTER (WHERE ws.state = 'PENDING') AS pending,
+    now() AS refreshed_at
+FROM nationality n
+LEFT JOIN nationality_cap c
+    ON c.nationality_id = n.id
+    AND c.year = EXTRACT(YEAR FROM CURRENT_DATE)::int
+LEFT JOIN worker_stock ws
+    ON ws.nationality_id = n.id
+GROUP BY n.id, n.code, n.name, c.cap_limit
+"""
+
+CREATE_SNAPSHOT_INDEX_SQL = f"""
+CREATE UNIQUE INDEX IF NOT EXISTS ux_{SNAPSHOT_VIEW}_code
+ON {SNAPSHOT_VIEW} (code)
+"""
+
+SELECT_SNAPSHOT_SQL = f"""
+SELECT nationality_id, code, name, cap_limit, stock, committed, pending, refreshed_at
+FROM {SNAPSHOT_VIEW}
+WHERE code = :code
+"""
+
+
+def supports_dashboard_snapshots(bind: Engine | Connection) -> bool:
+    """
+    Check whether the database backend supports the snapshot view.
+
+    Args:
+        bind: SQLAlchemy engine or connection.
+
+    Returns:
+        bool: True for PostgreSQL, False otherwise.
+    """
+    return bind.dialect.name == "postgresql"
+
+
+def create_dashboard_snapshots(engine: Engine) -> bool:
+    """
+    Create the dashboard_snapshots view and its unique index.
+
+    The unique index on code is required for REFRESH ... CONCURRENTLY.
+
+    Args:
+        engine: SQLAlchemy engine.
+
+    Returns:
+        bool: True if the view was created (or already existed).
+    """
+    if not supports_dashboard_snapshots(engine):
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_SNAPSHOT_VIEW_SQL))
+        conn.execute(text(CREATE_SNAPSHOT_INDEX_SQL))
+    return True
+
+
+def refresh_dashboard_snapshots(engine: Engine, concurrently: bool = True) -> bool:
+    """
+    Refresh the dashboard_snapshots view.
+
+    Args:
+        engine: SQLAlchemy engine.
+        concurrently: Refresh without blocking readers.
+
+    Returns:
+        bool: True if the view was refreshed.
+    """
+    if not supports_dashboard_snapshots(engine):
+        return False
+
+    mode = " CONCURRENTLY" if concurrently else ""
+    with engine.begin() as conn:
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW{mode} {SNAPSHOT_VIEW}"))
+    return True
+
+
+def drop_dashboard_snapshots(engine: Engine) -> bool:
+    """
+    Drop the dashboard_snapshots view (needed before dropping its tables).
+
+    Args:
+        engine: SQLAlchemy engine.
+
+    Returns:
+        bool: True if the drop statement was issued.
+    """
+    if not supports_dashboard_snapshots(engine):
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {SNAPSHOT_VIEW}"))
+    return True
+
+
+def get_dashboard_snapshot(db: Session, nationality_code: str) -> Optional[dict]:
+    """
+    Read the pre-aggregated dashboard row for a nationality.
+
+    Args:
+        db: Database session.
+        nationality_code: ISO 3-letter nationality code.
+
+    Returns:
+        dict: Snapshot row, or None if unsupported or not yet populated.
+    """
+    if not supports_dashboard_snapshots(db.get_bind()):
+        return None
+
+    row = db.execute(
+        text(SELECT_SNAPSHOT_SQL), {"code": nationality_code}
+    ).mappings().first()
+    return dict(row) if row else None
@@ -17,6 +17,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
@@ -72,6 +73,9 @@ class WorkerStock(BaseModel):
     """
     
     __tablename__ = "worker_stock"
+    __table_args__ = (
+        Index("ix_worker_stock_nationality_state", "nationality_id", "state"),
+    )
     
     worker_id = Column(
         String(50),
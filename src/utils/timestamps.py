@@ -0,0 +1,28 @@
+"""
+Shared 'last_updated' timestamps for dashboard payloads.
+
+Used by both the quota engine and the Streamlit data loaders, so their
+last_updated values agree. Dashboard payloads are cached for a minute
+or more, so sub-second precision in last_updated is meaningless. The
+ISO string is formatted once per wall-clock second and reused by every
+payload built in it.
+
+Usage:
+    from src.utils.timestamps import last_updated_str
+    payload["last_updated"] = last_updated_str()
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4)
+def _iso_for_second(second: int) -> str:
+    """Format a Unix second as a local ISO timestamp."""
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def last_updated_str() -> str:
+    """Current local time as an ISO string, at one-second resolution."""
+    return _iso_for_second(int(time.time()))
@@ -0,0 +1,209 @@
+"""
+Unit tests for the dashboard data loaders.
+
+Covers the SQL path in app.utils.db_queries.get_dashboard_data and the
+worker-file cache in app.utils.real_data_loader.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from datetime import date, timedelta
+
+from src.models import (
+    Establishment,
+    QuotaRequest,
+    RequestQueue,
+    RequestStatus,
+    WorkerStock,
+    WorkerState,
+)
+from app.utils import db_queries, real_data_loader
+
+
+@pytest.fixture
+def dashboard_records(
+    db_session,
+    sample_nationalities,
+    sample_professions,
+    sample_activities,
+    sample_caps,
+    sample_tiers,
+):
+    """Egyptian workers in each state plus queued requests in tiers 1 and 3."""
+    egypt = sample_nationalities[0]
+    profession = sample_professions[0]
+
+    establishment = Establishment(
+        name="Dashboard Test LLC",
+        activity_id=sample_activities[0].id,
+    )
+    db_session.add(establishment)
+    db_session.flush()
+
+    state_counts = {
+        WorkerState.IN_COUNTRY: 40,
+        WorkerState.COMMITTED: 5,
+        WorkerState.PENDING: 10,
+    }
+    for state, count in state_counts.items():
+        for _ in range(count):
+            db_session.add(WorkerStock(
+                nationality_id=egypt.id,
+                profession_id=profession.id,
+                establishment_id=establishment.id,
+                state=state,
+            ))
+
+    for position, tier in enumerate([1, 1, 3], start=1):
+        request = QuotaRequest(
+            establishment_id=establishment.id,
+            nationality_id=egypt.id,
+            profession_id=profession.id,
+            requested_count=1,
+            status=RequestStatus.QUEUED,
+            priority_score=0.0,
+        )
+        db_session.add(request)
+        db_session.flush()
+        db_session.add(RequestQueue(
+            request_id=request.id,
+            queue_position=position,
+            tier_at_submission=tier,
+            expiry_date=date.today() + timedelta(days=90),
+        ))
+
+    db_session.commit()
+    return egypt
+
+
+class TestGetDashboardData:
+    """Tests for get_dashboard_data against SQLite."""
+
+    @pytest.fixture(autouse=True)
+    def use_test_session(self, db_session, monkeypatch):
+        monkeypatch.setattr(db_queries, "get_db_session", lambda: db_session)
+
+    def test_worker_counts_and_headroom(self, dashboard_records):
+        """Worker states are counted separately and feed the headroom."""
+        data = db_queries.get_dashboard_data("EGY")
+
+        assert data["nationality_code"] == "EGY"
+        assert data["cap"] == 15000
+        assert data["stock"] == 40
+        assert data["committed"] == 5
+        assert data["pending"] == 10
+        assert data["headroom"] == 15000 - (40 + 5 + int(10 * 0.8))
+
+    def test_tier_rows_fall_back_to_defaults(self, dashboard_records):
+        """All four tiers are reported; tiers without rows use defaults."""
+        data = db_queries.get_dashboard_data("EGY")
+        tiers = data["tier_statuses"]
+
+        assert [t["tier_level"] for t in tiers] == [1, 2, 3, 4]
+        assert [t["tier_name"] for t in tiers] == [
+            "Primary", "Secondary", "Minor", "Unusual",
+        ]
+        assert [t["status"] for t in tiers] == ["OPEN", "OPEN", "LIMITED", "LIMITED"]
+        assert [t["share_pct"] for t in tiers] == pytest.approx([0.33, 0.12, 0.03, 0.01])
+
+        headroom = data["headroom"]
+        assert [t["capacity"] for t in tiers] == [
+            int(headroom * allocation) for allocation in (0.40, 0.30, 0.20, 0.10)
+        ]
+
+    def test_queue_counts_by_tier(self, dashboard_records):
+        """Only queued requests are counted, grouped by submission tier."""
+        data = db_queries.get_dashboard_data("EGY")
+
+        assert data["queue_counts"] == {1: 2, 2: 0, 3: 1, 4: 0}
+
+    def test_unknown_nationality_returns_demo_data(self, sample_nationalities):
+        """A code with no nationality row falls back to demo data."""
+        data = db_queries.get_dashboard_data("XXX")
+
+        assert data["nationality_code"] == "XXX"
+        assert len(data["tier_statuses"]) == 4
+
+
+class TestDashboardCache:
+    """Tests for the worker-file keyed cache in get_real_dashboard_data."""
+
+    @pytest.fixture
+    def worker_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "07_worker_stock.csv"
+        path.write_text("worker_id\n")
+
+        calls = {"metrics": 0, "clear_cache": 0}
+
+        def fake_metrics(nationality_code):
+            calls["metrics"] += 1
+            return {
+                "utilization_pct": 50.0,
+                "headroom": 1000,
+                "country_type": "QVC",
+                "tier_summary": {},
+                "current_stock": 2000,
+                "recommended_cap": 3000,
+                "desired_cap": 3000,
+                "avg_annual_joiners": 100,
+                "avg_annual_outflow": 80,
+                "joined_2024": 100,
+                "joined_2025": 100,
+                "left_2024": 80,
+                "left_2025": 80,
+                "growth_direction": "POSITIVE",
+                "growth_rate": 1.0,
+                "net_growth": 20,
+                "demand_basis": "joiners",
+                "demand_value": 100,
+                "buffer_pct": 0.1,
+                "buffer_value": 10,
+                "alert_count": 0,
+                "has_critical": False,
+            }
+
+        def fake_clear_cache():
+            calls["clear_cache"] += 1
+
+        monkeypatch.setattr(real_data_loader, "_WORKER_STOCK_FILE", path)
+        monkeypatch.setattr(real_data_loader, "_data_mtime_ns", 0)
+        monkeypatch.setattr(real_data_loader, "check_real_data_available", lambda: True)
+        monkeypatch.setattr(real_data_loader, "get_all_metrics", fake_metrics)
+        monkeypatch.setattr(
+            real_data_loader, "get_tier_statuses", lambda *args: ["OPEN"] * 4
+        )
+        monkeypatch.setattr(real_data_loader, "clear_cache", fake_clear_cache)
+
+        real_data_loader._compute_dashboard_cached.cache_clear()
+        yield path, calls
+        real_data_loader._compute_dashboard_cached.cache_clear()
+
+    def test_repeat_calls_reuse_payload(self, worker_file):
+        """An unchanged worker file serves the cached payload."""
+        _, calls = worker_file
+
+        first = real_data_loader.get_real_dashboard_data("EGY")
+        second = real_data_loader.get_real_dashboard_data("EGY")
+
+        assert calls["metrics"] == 1
+        assert first is not second
+        assert "last_updated" in second
+
+    def test_touching_worker_file_invalidates_cache(self, worker_file):
+        """A new worker file mtime recomputes and clears engine caches."""
+        path, calls = worker_file
+
+        real_data_loader.get_real_dashboard_data("EGY")
+
+        mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        real_data_loader.get_real_dashboard_data("EGY")
+
+        assert calls["metrics"] == 2
+        assert calls["clear_cache"] == 1